@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import Ad, ExchangeProposal
+from .models import Ad, ArchivedAd, ArchivedExchangeProposal, ExchangeProposal, SavedSearch
 
 admin.site.register(Ad)
 admin.site.register(ExchangeProposal)
+admin.site.register(ArchivedAd)
+admin.site.register(ArchivedExchangeProposal)
+admin.site.register(SavedSearch)
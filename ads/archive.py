@@ -0,0 +1,112 @@
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Ad, ArchivedAd, ArchivedExchangeProposal, ExchangeProposal
+
+CLOSED_STATUSES = ["accepted", "rejected"]
+
+
+def closed_proposals(older_than_days):
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return ExchangeProposal.objects.filter(status__in=CLOSED_STATUSES, created_at__lt=cutoff)
+
+
+def inactive_ads(older_than_days):
+    # Истёкшие и обменянные объявления: updated_at ставится при смене статуса.
+    # Объявление с ожидающими предложениями остаётся в рабочей таблице
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return (
+        Ad.objects.exclude(status="active")
+        .filter(updated_at__lt=cutoff)
+        .exclude(sent_proposals__status="pending")
+        .exclude(received_proposals__status="pending")
+    )
+
+
+def _archive_proposal_batch(ids):
+    proposals = ExchangeProposal.objects.filter(id__in=ids).select_related(
+        "ad_sender", "ad_receiver"
+    )
+    ArchivedExchangeProposal.objects.bulk_create([
+        ArchivedExchangeProposal(
+            id=p.id,
+            ad_sender_id=p.ad_sender_id,
+            ad_receiver_id=p.ad_receiver_id,
+            ad_sender_title=p.ad_sender.title,
+            ad_receiver_title=p.ad_receiver.title,
+            sender_user_id=p.ad_sender.user_id,
+            receiver_user_id=p.ad_receiver.user_id,
+            comment=p.comment,
+            status=p.status,
+            created_at=p.created_at,
+        )
+        for p in proposals
+    ], ignore_conflicts=True)
+    ExchangeProposal.objects.filter(id__in=ids).delete()
+
+
+def _archive_ad_batch(ids):
+    # Закрытые предложения объявления уходят в архив вместе с ним, иначе
+    # удаление объявления унесло бы их каскадом
+    proposal_ids = list(
+        ExchangeProposal.objects.filter(
+            Q(ad_sender_id__in=ids) | Q(ad_receiver_id__in=ids), status__in=CLOSED_STATUSES
+        ).values_list("id", flat=True)
+    )
+    if proposal_ids:
+        _archive_proposal_batch(proposal_ids)
+    ArchivedAd.objects.bulk_create([
+        ArchivedAd(
+            id=ad.id,
+            user_id=ad.user_id,
+            title=ad.title,
+            description=ad.description,
+            image_url=ad.image_url,
+            category=ad.category,
+            condition=ad.condition,
+            created_at=ad.created_at,
+            updated_at=ad.updated_at,
+        )
+        for ad in Ad.objects.filter(id__in=ids)
+    ], ignore_conflicts=True)
+    Ad.objects.filter(id__in=ids).delete()
+
+
+def run_batches(queryset, process_batch, batch_size, pause, max_batches):
+    """Обрабатывает строки порциями по batch_size, каждая порция — своя транзакция.
+
+    Между порциями делается пауза, чтобы не держать блокировку SQLite
+    и не мешать живым записям. Возвращает количество обработанных строк.
+    """
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            ids = list(queryset.order_by("id").values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            process_batch(ids)
+        total += len(ids)
+        batches += 1
+        if len(ids) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def archive_proposals(older_than_days=365, batch_size=500, pause=0.1, max_batches=None):
+    return run_batches(
+        closed_proposals(older_than_days), _archive_proposal_batch, batch_size, pause, max_batches
+    )
+
+
+def archive_ads(older_than_days=90, batch_size=500, pause=0.1, max_batches=None):
+    return run_batches(
+        inactive_ads(older_than_days), _archive_ad_batch, batch_size, pause, max_batches
+    )
+
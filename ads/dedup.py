@@ -0,0 +1,135 @@
+"""Поиск почти одинаковых объявлений: MinHash-сигнатуры + LSH-корзины.
+
+Текст (название + описание) разбивается на шинглы из трёх слов, по ним
+считается MinHash-сигнатура из NUM_PERM значений. Сигнатура режется на BANDS
+полос по ROWS значений; хеш каждой полосы — ключ корзины в таблице
+AdLSHBucket. Кандидаты на дубль — объявления, совпавшие хотя бы в одной
+корзине; окончательно сходство оценивается по сигнатурам.
+"""
+import hashlib
+import re
+import zlib
+
+import numpy as np
+
+from .models import Ad, AdLSHBucket, AdSignature
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+# Порог оценки сходства Жаккара, начиная с которого объявление считается дублем
+DUPLICATE_THRESHOLD = 0.8
+
+# Хеш-функции вида (a * x + b) mod P; при x < 2**32 и P = 2**31 - 1
+# произведение помещается в uint64 без переполнения. Коэффициенты выводятся
+# из blake2b, а не из ГСЧ, чтобы сохранённые сигнатуры не зависели от версии numpy.
+_PRIME = 2 ** 31 - 1
+
+
+def _coefficients(name):
+    return np.array([
+        int.from_bytes(hashlib.blake2b(f"{name}{i}".encode(), digest_size=8).digest(), "little")
+        % (_PRIME - 1) + 1
+        for i in range(NUM_PERM)
+    ], dtype=np.uint64)
+
+
+_A = _coefficients("a")
+_B = _coefficients("b")
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingle_hashes(title, description):
+    words = _WORD_RE.findall(f"{title} {description}".lower())
+    if len(words) < SHINGLE_SIZE:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {
+            " ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)
+        }
+    return np.fromiter(
+        (zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+
+
+def signatures(texts):
+    """Векторизованный MinHash для пачки (title, description).
+
+    Шинглы всех текстов склеиваются в один массив, хеш-функции применяются
+    к нему одной матричной операцией, а минимумы по каждому тексту берутся
+    через np.minimum.reduceat. Возвращает массив формы (len(texts), NUM_PERM).
+    """
+    if not texts:
+        return np.empty((0, NUM_PERM), dtype=np.uint32)
+    hashes = [shingle_hashes(title, description) for title, description in texts]
+    offsets = np.cumsum([0] + [len(h) for h in hashes[:-1]])
+    values = (_A[:, None] * np.concatenate(hashes)[None, :] + _B[:, None]) % np.uint64(_PRIME)
+    return np.minimum.reduceat(values, offsets, axis=1).T.astype(np.uint32)
+
+
+def signature(title, description):
+    return signatures([(title, description)])[0]
+
+
+def bucket_keys(sig):
+    keys = []
+    for band in range(BANDS):
+        digest = hashlib.blake2b(
+            sig[band * ROWS:(band + 1) * ROWS].tobytes(),
+            digest_size=8,
+            salt=band.to_bytes(2, "little"),
+        ).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+def similarity(sig1, sig2):
+    return float(np.count_nonzero(sig1 == sig2)) / NUM_PERM
+
+
+def to_bytes(sig):
+    return sig.astype("<u4").tobytes()
+
+
+def from_bytes(data):
+    return np.frombuffer(bytes(data), dtype="<u4")
+
+
+def index_ad(ad, sig=None):
+    """Сохраняет сигнатуру объявления и его LSH-корзины (перезаписывая старые)."""
+    if sig is None:
+        sig = signature(ad.title, ad.description)
+    AdSignature.objects.update_or_create(ad=ad, defaults={"signature": to_bytes(sig)})
+    AdLSHBucket.objects.filter(ad=ad).delete()
+    AdLSHBucket.objects.bulk_create([AdLSHBucket(ad=ad, key=key) for key in bucket_keys(sig)])
+
+
+def find_duplicate(title, description, user=None, exclude_id=None, threshold=DUPLICATE_THRESHOLD):
+    """Возвращает самое похожее активное объявление со сходством >= threshold или None."""
+    sig = signature(title, description)
+    # Покрывающий индекс (key, ad_id): у нового уникального объявления всё
+    # заканчивается одним индексным запросом без обращения к таблице
+    candidate_ids = set(
+        AdLSHBucket.objects.filter(key__in=bucket_keys(sig)).values_list("ad_id", flat=True)
+    )
+    candidate_ids.discard(exclude_id)
+    if not candidate_ids:
+        return None
+
+    # Истёкшие и обменянные объявления не мешают выставить вещь заново
+    candidates = AdSignature.objects.filter(
+        ad_id__in=candidate_ids, ad__deleted_at__isnull=True, ad__status="active"
+    )
+    if user is not None:
+        candidates = candidates.filter(ad__user=user)
+
+    best_id, best_score = None, 0.0
+    for ad_id, data in candidates.values_list("ad_id", "signature"):
+        score = similarity(sig, from_bytes(data))
+        if score > best_score:
+            best_id, best_score = ad_id, score
+    if best_id is None or best_score < threshold:
+        return None
+    return Ad.objects.get(id=best_id)
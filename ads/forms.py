@@ -1,20 +1,64 @@
 from django import forms
-from .models import Ad, ExchangeProposal
+from .dedup import find_duplicate
+from .models import Ad, ExchangeProposal, SavedSearch
 
 
 class AdForm(forms.ModelForm):
     class Meta:
         model = Ad
-        fields = ['title', 'description', 'image_url', 'category', 'condition']
+        fields = ['title', 'description', 'image_url', 'category', 'condition', 'latitude', 'longitude']
 
     image_url = forms.URLField(assume_scheme='https', required=False)
 
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Владелец нужен для поиска повторов среди его же объявлений;
+        # без владельца проверка повторов пропускается
+        self.user = user or (self.instance.user if self.instance.pk else None)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        title = cleaned_data.get('title')
+        description = cleaned_data.get('description')
+
+        if title and description and self.user is not None:
+            duplicate = find_duplicate(
+                title, description, user=self.user, exclude_id=self.instance.pk
+            )
+            if duplicate:
+                raise forms.ValidationError(
+                    f"Похожее объявление уже опубликовано: «{duplicate.title}»."
+                )
+
+        latitude = cleaned_data.get('latitude')
+        longitude = cleaned_data.get('longitude')
+
+        if (latitude is None) != (longitude is None) and not self.has_error('latitude') \
+                and not self.has_error('longitude'):
+            raise forms.ValidationError("Укажите обе координаты или ни одной.")
+        return cleaned_data
+
+    def save(self, commit=True):
+        if not commit or self.instance._state.adding:
+            return super().save(commit)
+        # Статус, срок и служебные флаги меняют фоновые UPDATE и proposal_update:
+        # при редактировании пишем только поля формы, чтобы не вернуть старые значения
+        self.instance.save(update_fields=[*self._meta.fields, 'updated_at'])
+        self._save_m2m()
+        return self.instance
+
 
 class ExchangeProposalForm(forms.ModelForm):
     class Meta:
         model = ExchangeProposal
         fields = ['ad_sender', 'ad_receiver', 'comment']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Предлагать к обмену можно только объявления из активного каталога
+        self.fields['ad_sender'].queryset = Ad.objects.active()
+        self.fields['ad_receiver'].queryset = Ad.objects.active()
+
     def clean(self):
         cleaned_data = super().clean()
         sender = cleaned_data.get('ad_sender')
@@ -24,4 +68,17 @@ class ExchangeProposalForm(forms.ModelForm):
             if sender == receiver:
                 raise forms.ValidationError("Нельзя обмениваться одним и тем же объявлением.")
             if sender.user == receiver.user:
-                raise forms.ValidationError("Нельзя обмениваться своими собственными объявлениями.")
\ No newline at end of file
+                raise forms.ValidationError("Нельзя обмениваться своими собственными объявлениями.")
+
+
+class SavedSearchForm(forms.ModelForm):
+    class Meta:
+        model = SavedSearch
+        fields = ['query', 'category', 'condition']
+
+    def clean(self):
+        cleaned_data = super().clean()
+        # Пустой поиск подходил бы каждому новому объявлению
+        if not any(cleaned_data.get(field) for field in ('query', 'category', 'condition')):
+            raise forms.ValidationError("Укажите запрос, категорию или состояние.")
+        return cleaned_data
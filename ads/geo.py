@@ -0,0 +1,126 @@
+"""Геопоиск без GIS-расширений: geohash-ячейки + точная проверка haversine.
+
+Каждое объявление с координатами хранит geohash. Поиск «рядом» сначала сужает
+кандидатов диапазонными запросами по индексу geohash (ячейки, покрывающие
+ограничивающий прямоугольник окружности), а затем отбрасывает лишнее точной формулой haversine.
+"""
+import math
+
+from django.db.models import F, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Символ больше любого символа BASE32: верхняя граница диапазона для префикса
+PREFIX_END = "~"
+GEOHASH_PRECISION = 9
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+MAX_RADIUS_KM = 500
+# Сколько диапазонов по индексу допускается в одном запросе
+MAX_CELLS = 24
+
+
+def encode(lat, lng, precision=GEOHASH_PRECISION):
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # чётные биты кодируют долготу
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = bits * 2 + 1
+            rng[0] = mid
+        else:
+            bits = bits * 2
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """Размер ячейки в градусах: (по широте, по долготе)."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def covering_cells(lat, lng, radius_km, max_cells=MAX_CELLS):
+    """Ячейки geohash, покрывающие ограничивающий прямоугольник окружности.
+
+    Берётся самая мелкая точность, при которой ячеек не больше max_cells:
+    чем мельче ячейки, тем меньше лишних кандидатов попадает в выборку.
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    # Долготный размах считаем на дальнем от экватора краю прямоугольника
+    cos_lat = math.cos(math.radians(min(abs(lat) + dlat, 90.0)))
+    dlng = 180.0 if cos_lat < 1e-6 else min(dlat / cos_lat, 180.0)
+    south, north = max(lat - dlat, -90.0), min(lat + dlat, 90.0 - 1e-9)
+
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lng_deg = cell_size(precision)
+        rows = range(math.floor((south + 90) / lat_deg), math.floor((north + 90) / lat_deg) + 1)
+        first_col = math.floor((lng - dlng + 180) / lng_deg)
+        last_col = math.floor((lng + dlng + 180) / lng_deg)
+        total_cols = round(360 / lng_deg)
+        cols = range(first_col, min(last_col, first_col + total_cols - 1) + 1)
+        if len(rows) * len(cols) <= max_cells or precision == 1:
+            break
+
+    cells = set()
+    for row in rows:
+        cell_lat = -90 + (row + 0.5) * lat_deg
+        for col in cols:
+            cell_lng = -180 + ((col % total_cols) + 0.5) * lng_deg
+            cells.add(encode(cell_lat, cell_lng, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def haversine_expression(lat, lng):
+    """То же расстояние в SQL (на SQLite функции регистрирует сам Django)."""
+    dlat = Radians(F("latitude") - Value(lat))
+    dlng = Radians(F("longitude") - Value(lng))
+    a = Power(Sin(dlat / 2), 2) + Cos(Value(math.radians(lat))) * Cos(Radians(F("latitude"))) * Power(
+        Sin(dlng / 2), 2
+    )
+    return 2 * EARTH_RADIUS_KM * ASin(Sqrt(a))
+
+
+def filter_near(queryset, lat, lng, radius_km):
+    cells = Q()
+    for cell in covering_cells(lat, lng, radius_km):
+        cells |= Q(geohash__gte=cell, geohash__lt=cell + PREFIX_END)
+    return (
+        queryset.filter(cells)
+        .annotate(distance_km=haversine_expression(lat, lng))
+        .filter(distance_km__lte=radius_km)
+    )
+
+
+def parse_near(near, radius, default_radius=10):
+    """Разбирает ?near=lat,lng&radius=km; при ошибке возвращает None."""
+    try:
+        lat, lng = (float(part) for part in near.split(","))
+        radius_km = float(radius) if radius else default_radius
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180) or not 0 < radius_km <= MAX_RADIUS_KM:
+        return None
+    return lat, lng, radius_km
@@ -0,0 +1,19 @@
+from django.utils import timezone
+
+from .archive import run_batches
+from .models import Ad
+
+
+def expired_ads():
+    return Ad.all_objects.filter(status="active", expires_at__lte=timezone.now())
+
+
+def _expire_ad_batch(ids):
+    # updated_at — время снятия с каталога, от него считает срок archive_ads
+    Ad.all_objects.filter(id__in=ids, status="active").update(
+        status="expired", updated_at=timezone.now()
+    )
+
+
+def expire_ads(batch_size=500, pause=0.1, max_batches=None):
+    return run_batches(expired_ads(), _expire_ad_batch, batch_size, pause, max_batches)
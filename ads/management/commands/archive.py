@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from ads.archive import archive_ads, archive_proposals
+
+
+class Command(BaseCommand):
+    help = "Переносит в архив закрытые предложения и давно снятые с каталога объявления."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--proposal-days", type=int, default=365,
+            help="Архивировать принятые/отклонённые предложения старше N дней.",
+        )
+        parser.add_argument(
+            "--ad-days", type=int, default=90,
+            help="Архивировать истёкшие и обменянные объявления через N дней после снятия.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause", type=float, default=0.1,
+            help="Пауза между порциями в секундах.",
+        )
+        parser.add_argument(
+            "--max-batches", type=int, default=None,
+            help="Ограничить число порций за один запуск.",
+        )
+
+    def handle(self, *args, **options):
+        batch_options = {
+            "batch_size": options["batch_size"],
+            "pause": options["pause"],
+            "max_batches": options["max_batches"],
+        }
+        proposals = archive_proposals(options["proposal_days"], **batch_options)
+        ads = archive_ads(options["ad_days"], **batch_options)
+        self.stdout.write(
+            self.style.SUCCESS(f"В архив перенесено: предложений — {proposals}, объявлений — {ads}.")
+        )
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from ads.metrics import backfill, rollup
+
+
+class Command(BaseCommand):
+    help = "Создаёт события для предложений без журнала и пересчитывает агрегаты."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = backfill(batch_size=options["batch_size"])
+        processed = rollup(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Создано событий: {created}, учтено: {processed}.")
+        )
@@ -0,0 +1,123 @@
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from ads import dedup
+from ads.models import Ad, AdLSHBucket, AdSignature
+
+
+# Ограничение числа параметров в одном запросе (SQLite)
+UPDATE_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Пересчитывает индекс почти-дублей для всего каталога и скрывает "
+        "активные повторы объявлений одного продавца (остаётся самое раннее)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--threshold", type=float, default=dedup.DUPLICATE_THRESHOLD)
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Только показать найденные дубли, ничего не удалять.",
+        )
+
+    def handle(self, *args, **options):
+        indexed = self.rebuild_index(options["batch_size"])
+        duplicates = self.find_duplicates(options["threshold"])
+
+        if duplicates and not options["dry_run"]:
+            now = timezone.now()
+            for start in range(0, len(duplicates), UPDATE_BATCH_SIZE):
+                Ad.objects.filter(
+                    id__in=duplicates[start:start + UPDATE_BATCH_SIZE]
+                ).update(deleted_at=now)
+
+        action = "найдено" if options["dry_run"] else "скрыто"
+        self.stdout.write(self.style.SUCCESS(
+            f"Проиндексировано объявлений: {indexed}, дублей {action}: {len(duplicates)}."
+        ))
+
+    def rebuild_index(self, batch_size):
+        total = 0
+        last_id = 0
+        while True:
+            rows = list(
+                Ad.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", "title", "description")[:batch_size]
+            )
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            # Сигнатуры всей пачки считаются одной векторной операцией
+            sigs = dedup.signatures([(title, description) for _, title, description in rows])
+
+            with transaction.atomic():
+                AdLSHBucket.objects.filter(ad_id__in=ids).delete()
+                AdSignature.objects.filter(ad_id__in=ids).delete()
+                AdSignature.objects.bulk_create([
+                    AdSignature(ad_id=ad_id, signature=dedup.to_bytes(sig))
+                    for ad_id, sig in zip(ids, sigs)
+                ])
+                # Корзин в BANDS раз больше, чем объявлений: вставляем без ORM
+                with connection.cursor() as cursor:
+                    cursor.executemany(
+                        f"INSERT INTO {connection.ops.quote_name(AdLSHBucket._meta.db_table)} "
+                        f"(ad_id, key) VALUES (%s, %s)",
+                        [
+                            (ad_id, key)
+                            for ad_id, sig in zip(ids, sigs)
+                            for key in dedup.bucket_keys(sig)
+                        ],
+                    )
+            total += len(ids)
+            last_id = ids[-1]
+        return total
+
+    def find_duplicates(self, threshold):
+        """Возвращает id объявлений-повторов (все, кроме самого раннего в группе)."""
+        parent = {}
+
+        def find(ad_id):
+            while parent.get(ad_id, ad_id) != ad_id:
+                ad_id = parent[ad_id]
+            return ad_id
+
+        shared_keys = (
+            AdLSHBucket.objects.filter(ad__deleted_at__isnull=True, ad__status="active")
+            .values("key")
+            .annotate(n=Count("id"))
+            .filter(n__gt=1)
+            .values("key")
+        )
+        # Один проход по общим корзинам, отсортированным по ключу, вместо
+        # запроса на каждый ключ
+        rows = (
+            AdLSHBucket.objects.filter(
+                key__in=shared_keys, ad__deleted_at__isnull=True, ad__status="active"
+            )
+            .order_by("key", "ad_id")
+            .values_list("key", "ad_id", "ad__user_id", "ad__signature__signature")
+            .iterator(chunk_size=2000)
+        )
+        for _, members in groupby(rows, key=lambda row: row[0]):
+            sigs = [
+                (ad_id, user_id, dedup.from_bytes(data))
+                for _, ad_id, user_id, data in members
+                if data is not None
+            ]
+            for i, (id1, user1, sig1) in enumerate(sigs):
+                for id2, user2, sig2 in sigs[i + 1:]:
+                    if user1 == user2 and dedup.similarity(sig1, sig2) >= threshold:
+                        root1, root2 = find(id1), find(id2)
+                        if root1 != root2:
+                            # Корнем группы остаётся самое раннее объявление
+                            parent[max(root1, root2)] = min(root1, root2)
+
+        return sorted(ad_id for ad_id in parent if find(ad_id) != ad_id)
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from ads.purge import delete_user
+
+
+class Command(BaseCommand):
+    help = "Удаляет пользователя, вычищая его объявления и предложения порциями."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Сколько предложений удалять одним DELETE.",
+        )
+        parser.add_argument(
+            "--ad-batch-size", type=int, default=100,
+            help="Сколько объявлений обрабатывать за один проход.",
+        )
+        parser.add_argument(
+            "--pause", type=float, default=0.1,
+            help="Пауза между порциями в секундах.",
+        )
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options["username"]).first()
+        if user is None:
+            raise CommandError(f"Пользователь {options['username']} не найден.")
+        ads, proposals = delete_user(
+            user,
+            batch_size=options["batch_size"],
+            ad_batch_size=options["ad_batch_size"],
+            pause=options["pause"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Удалено: объявлений — {ads}, предложений — {proposals}.")
+        )
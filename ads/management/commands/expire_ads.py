@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from ads.lifecycle import expire_ads
+
+
+class Command(BaseCommand):
+    help = "Снимает с каталога объявления, у которых истёк срок размещения."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--pause", type=float, default=0.1,
+            help="Пауза между порциями в секундах.",
+        )
+        parser.add_argument(
+            "--max-batches", type=int, default=None,
+            help="Ограничить число порций за один запуск.",
+        )
+
+    def handle(self, *args, **options):
+        expired = expire_ads(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Истекло объявлений: {expired}."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from ads.percolator import match_pending_ads
+
+
+class Command(BaseCommand):
+    help = "Сопоставляет новые объявления с сохранёнными поисками пользователей."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--pause", type=float, default=0.1,
+            help="Пауза между порциями в секундах.",
+        )
+        parser.add_argument(
+            "--max-batches", type=int, default=None,
+            help="Ограничить число порций за один запуск.",
+        )
+
+    def handle(self, *args, **options):
+        ads, matches = match_pending_ads(
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Проверено объявлений: {ads}, совпадений: {matches}.")
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from ads.purge import purge_deleted_ads
+
+
+class Command(BaseCommand):
+    help = "Вычищает удалённые объявления и их предложения порциями."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Сколько предложений удалять одним DELETE.",
+        )
+        parser.add_argument(
+            "--ad-batch-size", type=int, default=100,
+            help="Сколько объявлений обрабатывать за один проход.",
+        )
+        parser.add_argument(
+            "--pause", type=float, default=0.1,
+            help="Пауза между порциями в секундах.",
+        )
+        parser.add_argument(
+            "--max-batches", type=int, default=None,
+            help="Ограничить число порций за один запуск.",
+        )
+
+    def handle(self, *args, **options):
+        ads, proposals = purge_deleted_ads(
+            batch_size=options["batch_size"],
+            ad_batch_size=options["ad_batch_size"],
+            pause=options["pause"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Удалено: объявлений — {ads}, предложений — {proposals}.")
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ads.metrics import rollup
+
+
+class Command(BaseCommand):
+    help = "Добавляет новые события предложений к дневным агрегатам метрик."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--max-batches", type=int, default=None)
+
+    def handle(self, *args, **options):
+        processed = rollup(
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Учтено событий: {processed}."))
@@ -0,0 +1,119 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DailyProposalStats, ExchangeProposal, ProposalEvent, RollupCursor
+
+CURSOR_NAME = "daily_proposal_stats"
+
+
+def record_event(proposal, from_status=""):
+    """Пишет в журнал смену статуса предложения; вызывается в той же транзакции, что и save()."""
+    return ProposalEvent.objects.create(
+        proposal_id=proposal.id,
+        category=proposal.ad_receiver.category,
+        from_status=from_status,
+        to_status=proposal.status,
+        proposal_created_at=proposal.created_at,
+    )
+
+
+def _aggregate(events):
+    totals = defaultdict(lambda: defaultdict(float))
+    for event in events:
+        row = totals[(timezone.localdate(event.created_at), event.category)]
+        if not event.from_status and event.to_status == "pending":
+            row["created"] += 1
+        elif event.to_status == "accepted":
+            row["accepted"] += 1
+            if event.proposal_created_at is not None:
+                waited = event.created_at - event.proposal_created_at
+                row["acceptance_seconds"] += max(waited.total_seconds(), 0)
+                row["acceptance_count"] += 1
+        elif event.to_status == "rejected":
+            row["rejected"] += 1
+    return totals
+
+
+def _apply(totals):
+    for (day, category), row in totals.items():
+        stats, _ = DailyProposalStats.objects.get_or_create(day=day, category=category)
+        DailyProposalStats.objects.filter(id=stats.id).update(**{
+            field: F(field) + value for field, value in row.items()
+        })
+
+
+def rollup(batch_size=1000, max_batches=None):
+    """
+    Добавляет к дневным агрегатам события, появившиеся после прошлого запуска.
+
+    Курсор (id последнего учтённого события) двигается в одной транзакции
+    с агрегатами, поэтому повторный или прерванный запуск ничего не посчитает дважды.
+    """
+    processed = batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            cursor, _ = RollupCursor.objects.select_for_update().get_or_create(name=CURSOR_NAME)
+            events = list(
+                ProposalEvent.objects.filter(id__gt=cursor.last_event_id).order_by("id")[:batch_size]
+            )
+            if not events:
+                break
+            _apply(_aggregate(events))
+            cursor.last_event_id = events[-1].id
+            cursor.save(update_fields=["last_event_id"])
+        processed += len(events)
+        batches += 1
+    return processed
+
+
+def backfill(batch_size=1000):
+    """
+    Создаёт события для предложений, появившихся до журнала.
+
+    Время смены статуса у старых предложений неизвестно: закрывающее событие
+    датируется created_at и не участвует во времени до принятия. Старое
+    предложение, закрытое уже после появления журнала, получает только
+    событие создания.
+    """
+    created = 0
+    proposals = (
+        ExchangeProposal.objects.exclude(
+            id__in=ProposalEvent.objects.filter(from_status="", to_status="pending")
+            .values("proposal_id")
+        ).select_related("ad_receiver").order_by("id")
+    )
+    last_id = 0
+    while True:
+        batch = list(proposals.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        closed = set(
+            ProposalEvent.objects.filter(proposal_id__in=[p.id for p in batch])
+            .exclude(from_status="")
+            .values_list("proposal_id", flat=True)
+        )
+        events = []
+        for p in batch:
+            category = p.ad_receiver.category
+            events.append(ProposalEvent(
+                proposal_id=p.id, category=category, to_status="pending",
+                proposal_created_at=p.created_at, created_at=p.created_at,
+            ))
+            if p.status != "pending" and p.id not in closed:
+                events.append(ProposalEvent(
+                    proposal_id=p.id, category=category, from_status="pending",
+                    to_status=p.status, created_at=p.created_at,
+                ))
+        ProposalEvent.objects.bulk_create(events)
+        created += len(events)
+        last_id = batch[-1].id
+    return created
+
+
+def dashboard_rows(days=30):
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return DailyProposalStats.objects.filter(day__gte=since).order_by("-day", "category")
@@ -0,0 +1,58 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_updated_at(apps, schema_editor):
+    # Для существующих объявлений считаем датой изменения дату создания
+    Ad = apps.get_model('ads', 'Ad')
+    Ad.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ads', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ad',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ArchivedAd',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('image_url', models.URLField(blank=True, null=True)),
+                ('category', models.CharField(max_length=100)),
+                ('condition', models.CharField(choices=[('new', 'Новый'), ('used', 'Б/у')], max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_ads', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedExchangeProposal',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('ad_sender_id', models.BigIntegerField()),
+                ('ad_receiver_id', models.BigIntegerField()),
+                ('ad_sender_title', models.CharField(max_length=255)),
+                ('ad_receiver_title', models.CharField(max_length=255)),
+                ('comment', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('accepted', 'Принята'), ('rejected', 'Отклонена')], max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('receiver_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_received_proposals', to=settings.AUTH_USER_MODEL)),
+                ('sender_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_sent_proposals', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,82 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ads', '0005_ad_duplicate_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(blank=True, max_length=255)),
+                ('category', models.CharField(blank=True, max_length=100)),
+                ('condition', models.CharField(blank=True, choices=[('new', 'Новый'), ('used', 'Б/у')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SavedSearchMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SavedSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=32)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='ad',
+            name='searches_matched',
+            # Уже опубликованные объявления не должны порождать оповещений
+            field=models.BooleanField(default=True, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='ad',
+            name='searches_matched',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='ad',
+            index=models.Index(condition=models.Q(('searches_matched', False)), fields=['id'], name='ad_searches_pending_idx'),
+        ),
+        migrations.AddField(
+            model_name='savedsearch',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='savedsearchmatch',
+            name='ad',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_matches', to='ads.ad'),
+        ),
+        migrations.AddField(
+            model_name='savedsearchmatch',
+            name='search',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='ads.savedsearch'),
+        ),
+        migrations.AddField(
+            model_name='savedsearchterm',
+            name='search',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='ads.savedsearch'),
+        ),
+        migrations.AddConstraint(
+            model_name='savedsearchmatch',
+            constraint=models.UniqueConstraint(fields=('search', 'ad'), name='saved_search_match_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearchterm',
+            index=models.Index(fields=['key', 'search'], name='saved_search_term_key_idx'),
+        ),
+    ]
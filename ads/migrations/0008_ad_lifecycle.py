@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_lifecycle(apps, schema_editor):
+    # Существующие объявления получают полный срок с момента миграции, а не
+    # с created_at — иначе первый же запуск expire_ads снял бы почти весь каталог.
+    # Объявления из принятых предложений считаем обменянными.
+    Ad = apps.get_model('ads', 'Ad')
+    ExchangeProposal = apps.get_model('ads', 'ExchangeProposal')
+    Ad.objects.update(expires_at=timezone.now() + timedelta(days=settings.AD_LIFETIME_DAYS))
+    accepted = ExchangeProposal.objects.filter(status='accepted')
+    Ad.objects.filter(
+        models.Q(id__in=accepted.values('ad_sender_id'))
+        | models.Q(id__in=accepted.values('ad_receiver_id'))
+    ).update(status='traded')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ads', '0007_proposal_metrics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ad',
+            name='ad_live_created_idx',
+        ),
+        migrations.AddField(
+            model_name='ad',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='ad',
+            name='status',
+            field=models.CharField(choices=[('active', 'Активно'), ('traded', 'Обменяно'), ('expired', 'Истекло')], default='active', editable=False, max_length=10),
+        ),
+        migrations.RunPython(fill_lifecycle, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ad',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status', 'active')), fields=['-created_at'], name='ad_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ad',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['expires_at'], name='ad_active_expiry_idx'),
+        ),
+    ]
@@ -1,5 +1,24 @@
+from datetime import timedelta
+
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Q
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils import timezone
+
+from . import geo
+
+
+class ActiveAdManager(models.Manager):
+    """Менеджер по умолчанию: скрывает удалённые объявления."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+    def active(self):
+        """Каталог: объявления, которые ещё можно предложить к обмену."""
+        return self.get_queryset().filter(status='active')
 
 
 class Ad(models.Model):
@@ -7,17 +26,87 @@ class Ad(models.Model):
         ('new', 'Новый'),
         ('used', 'Б/у'),
     ]
+    STATUS_CHOICES = [
+        ('active', 'Активно'),
+        ('traded', 'Обменяно'),
+        ('expired', 'Истекло'),
+    ]
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     description = models.TextField()
     image_url = models.URLField(blank=True, null=True)
     category = models.CharField(max_length=100)
     condition = models.CharField(max_length=10, choices=CONDITION_CHOICES)
+    latitude = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        null=True, blank=True, validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    # Ячейка сетки для поиска по расстоянию, заполняется в save()
+    geohash = models.CharField(max_length=12, null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Мягкое удаление: строка и связанные предложения вычищаются позже
+    # командой purge_deleted_ads, а не каскадом в запросе пользователя
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    # Проверено ли новое объявление по сохранённым поискам (match_saved_searches)
+    searches_matched = models.BooleanField(default=False, editable=False)
+    # Жизненный цикл: active → traded (принято предложение) или expired (команда expire_ads)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='active', editable=False)
+    expires_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = ActiveAdManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-created_at'],
+                name='ad_active_created_idx',
+                condition=Q(status='active', deleted_at__isnull=True),
+            ),
+            models.Index(
+                fields=['expires_at'],
+                name='ad_active_expiry_idx',
+                condition=Q(status='active'),
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                name='ad_deleted_idx',
+                condition=Q(deleted_at__isnull=False),
+            ),
+            models.Index(
+                fields=['geohash'],
+                name='ad_geohash_idx',
+                condition=Q(geohash__isnull=False),
+            ),
+            models.Index(
+                fields=['id'],
+                name='ad_searches_pending_idx',
+                condition=Q(searches_matched=False),
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.expires_at is None:
+            self.expires_at = timezone.now() + timedelta(days=settings.AD_LIFETIME_DAYS)
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+        else:
+            self.geohash = None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self.save(update_fields=['deleted_at'])
+
 
 class ExchangeProposal(models.Model):
     STATUS_CHOICES = [
@@ -33,3 +122,141 @@ class ExchangeProposal(models.Model):
 
     def __str__(self):
         return f'{self.ad_sender.title} → {self.ad_receiver.title} ({self.status})'
+
+
+# Индекс почти-дублей (см. ads/dedup.py): MinHash-сигнатура объявления
+# и LSH-корзины, по которым ищутся кандидаты
+class AdSignature(models.Model):
+    ad = models.OneToOneField(Ad, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    signature = models.BinaryField()
+
+
+class AdLSHBucket(models.Model):
+    ad = models.ForeignKey(Ad, on_delete=models.CASCADE, related_name='lsh_buckets')
+    key = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['key', 'ad'], name='ad_lsh_bucket_key_idx'),
+        ]
+
+
+# Сохранённые поиски (см. ads/percolator.py): параметры как у ad_list,
+# обратный индекс по терминам и найденные совпадения с новыми объявлениями
+class SavedSearch(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    query = models.CharField(max_length=255, blank=True)
+    category = models.CharField(max_length=100, blank=True)
+    condition = models.CharField(max_length=10, choices=Ad.CONDITION_CHOICES, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        parts = [self.query, self.category, self.get_condition_display()]
+        return ' / '.join(part for part in parts if part) or 'Все объявления'
+
+
+class SavedSearchTerm(models.Model):
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='terms')
+    key = models.CharField(max_length=32)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['key', 'search'], name='saved_search_term_key_idx'),
+        ]
+
+
+class SavedSearchMatch(models.Model):
+    search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    ad = models.ForeignKey(Ad, on_delete=models.CASCADE, related_name='search_matches')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['search', 'ad'], name='saved_search_match_unique'),
+        ]
+
+
+# Метрики (см. ads/metrics.py): журнал смен статуса предложений только на
+# добавление и дневные агрегаты, которые из него строит rollup_metrics
+class ProposalEvent(models.Model):
+    # Без внешнего ключа: предложение может уйти в архив или быть удалено
+    proposal_id = models.BigIntegerField()
+    category = models.CharField(max_length=100)
+    from_status = models.CharField(max_length=10, choices=ExchangeProposal.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=10, choices=ExchangeProposal.STATUS_CHOICES)
+    # Пусто у событий из backfill, где время смены статуса неизвестно
+    proposal_created_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['proposal_id'], name='proposal_event_proposal_idx'),
+        ]
+
+
+class DailyProposalStats(models.Model):
+    day = models.DateField()
+    category = models.CharField(max_length=100)
+    created = models.PositiveIntegerField(default=0)
+    accepted = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    # Сумма и число интервалов «создано → принято» для среднего времени принятия
+    acceptance_seconds = models.FloatField(default=0)
+    acceptance_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category'], name='daily_proposal_stats_unique'),
+        ]
+
+    @property
+    def avg_acceptance_hours(self):
+        if not self.acceptance_count:
+            return None
+        return self.acceptance_seconds / self.acceptance_count / 3600
+
+
+class RollupCursor(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    last_event_id = models.BigIntegerField(default=0)
+
+
+# Архив: закрытые предложения и давно не менявшиеся объявления переносятся сюда
+# командой archive, чтобы не раздувать рабочие таблицы и их индексы.
+class ArchivedAd(models.Model):
+    id = models.BigIntegerField(primary_key=True)  # id исходного объявления
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_ads')
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    image_url = models.URLField(blank=True, null=True)
+    category = models.CharField(max_length=100)
+    condition = models.CharField(max_length=10, choices=Ad.CONDITION_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedExchangeProposal(models.Model):
+    id = models.BigIntegerField(primary_key=True)  # id исходного предложения
+    # Объявления могут быть как в рабочей таблице, так и в архиве, поэтому
+    # храним их id и названия без внешних ключей
+    ad_sender_id = models.BigIntegerField()
+    ad_receiver_id = models.BigIntegerField()
+    ad_sender_title = models.CharField(max_length=255)
+    ad_receiver_title = models.CharField(max_length=255)
+    sender_user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='archived_sent_proposals'
+    )
+    receiver_user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='archived_received_proposals'
+    )
+    comment = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=ExchangeProposal.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'{self.ad_sender_title} → {self.ad_receiver_title} ({self.status})'
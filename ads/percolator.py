@@ -0,0 +1,163 @@
+"""Обратный поиск: какие сохранённые поиски подходят новому объявлению.
+
+Перебирать все сохранённые поиски на каждое объявление слишком дорого, поэтому
+каждый поиск заносится в обратный индекс (SavedSearchTerm) ровно под одним
+ключом — самым редким из необходимых условий:
+
+* ``q:<n-грамма>`` — если задан текст запроса. Запрос ищется как подстрока
+  (как в ad_list), значит любая его n-грамма обязана встретиться в тексте
+  объявления; короткий запрос (не длиннее GRAM) служит ключом целиком;
+* ``c:<n-грамма>`` — если задана только категория;
+* ``s:<состояние>`` — если задано только состояние;
+* ``*`` — пустой поиск, подходит всему.
+
+Для объявления строится множество его ключей, по индексу выбираются
+кандидаты, а точная проверка повторяет фильтры ad_list.
+
+Ключи строятся по str.lower() и потому шире точной проверки: icontains
+на SQLite не различает регистр только у ASCII, и matches() делает так же.
+"""
+import string
+import time
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Ad, SavedSearch, SavedSearchMatch, SavedSearchTerm
+
+# Длина n-граммы ключа: чем длиннее, тем избирательнее индекс, но тем
+# больше ключей у объявления (все подстроки длиной от 1 до GRAM)
+GRAM = 5
+MATCH_ALL = "*"
+# Ограничение числа параметров в одном запросе (SQLite)
+KEYS_PER_QUERY = 500
+# LIKE в SQLite (icontains) приводит к нижнему регистру только латиницу
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _grams(text, max_size=GRAM):
+    """Все подстроки длины от 1 до max_size."""
+    return {
+        text[i:i + size]
+        for size in range(1, max_size + 1)
+        for i in range(len(text) - size + 1)
+    }
+
+
+def _needed_grams(text):
+    # Для короткого запроса ключ — сам запрос, для длинного — его n-граммы
+    if len(text) <= GRAM:
+        return {text}
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def search_keys(query, category, condition):
+    """Ключи, любой из которых годится для индексации поиска."""
+    query = query.strip().lower()
+    category = category.strip().lower()
+    if query:
+        return sorted("q:" + gram for gram in _needed_grams(query))
+    if category:
+        return sorted("c:" + gram for gram in _needed_grams(category))
+    if condition:
+        return ["s:" + condition]
+    return [MATCH_ALL]
+
+
+def ad_keys(title, description, category, condition):
+    keys = {"q:" + gram for gram in _grams(title.lower()) | _grams(description.lower())}
+    keys |= {"c:" + gram for gram in _grams(category.lower())}
+    keys |= {"s:" + condition, MATCH_ALL}
+    return keys
+
+
+def pick_key(keys, counts):
+    """Самый редкий ключ: чем меньше постингов, тем меньше лишних кандидатов."""
+    return min(keys, key=lambda key: (counts.get(key, 0), key))
+
+
+def index_search(search):
+    keys = search_keys(search.query, search.category, search.condition)
+    counts = dict(
+        SavedSearchTerm.objects.filter(key__in=keys)
+        .values("key")
+        .annotate(n=Count("id"))
+        .values_list("key", "n")
+    )
+    with transaction.atomic():
+        SavedSearchTerm.objects.filter(search=search).delete()
+        SavedSearchTerm.objects.create(search=search, key=pick_key(keys, counts))
+
+
+def _fold(text):
+    return text.translate(_ASCII_LOWER)
+
+
+def matches(search, ad):
+    """Повторяет фильтры ad_list, включая регистр: кириллица сравнивается как есть."""
+    if search.query:
+        query = _fold(search.query)
+        if query not in _fold(ad.title) and query not in _fold(ad.description):
+            return False
+    if search.category and _fold(search.category) not in _fold(ad.category):
+        return False
+    if search.condition and search.condition != ad.condition:
+        return False
+    return True
+
+
+def candidate_search_ids(ad):
+    keys = sorted(ad_keys(ad.title, ad.description, ad.category, ad.condition))
+    ids = set()
+    for start in range(0, len(keys), KEYS_PER_QUERY):
+        ids.update(
+            SavedSearchTerm.objects.filter(key__in=keys[start:start + KEYS_PER_QUERY])
+            .values_list("search_id", flat=True)
+        )
+    return ids
+
+
+def match_ad(ad):
+    """Находит сохранённые поиски, подходящие объявлению, записывает совпадения
+    и отмечает объявление проверенным.
+
+    Поиск кандидатов идёт вне транзакции; блокировка записи SQLite берётся
+    только на короткую вставку совпадений. Возвращает id подошедших поисков.
+    """
+    ids = sorted(candidate_search_ids(ad))
+    matched = []
+    for start in range(0, len(ids), KEYS_PER_QUERY):
+        rows = (
+            SavedSearch.objects.filter(id__in=ids[start:start + KEYS_PER_QUERY])
+            .exclude(user_id=ad.user_id)
+            .values_list("id", "query", "category", "condition", named=True)
+        )
+        matched.extend(row.id for row in rows if matches(row, ad))
+    with transaction.atomic():
+        SavedSearchMatch.objects.bulk_create(
+            [SavedSearchMatch(search_id=search_id, ad=ad) for search_id in matched],
+            ignore_conflicts=True,
+        )
+        Ad.all_objects.filter(id=ad.id).update(searches_matched=True)
+    return matched
+
+
+def match_pending_ads(batch_size=100, pause=0.1, max_batches=None):
+    """Фоновый шаг после ad_create: обрабатывает ещё не проверенные объявления.
+
+    Каждое объявление фиксируется своей короткой транзакцией, между порциями
+    делается пауза, чтобы не мешать живым записям.
+    """
+    total_ads = total_matches = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ads = list(Ad.objects.filter(searches_matched=False).order_by("id")[:batch_size])
+        if not ads:
+            break
+        for ad in ads:
+            total_matches += len(match_ad(ad))
+        total_ads += len(ads)
+        batches += 1
+        if pause:
+            time.sleep(pause)
+    return total_ads, total_matches
@@ -0,0 +1,87 @@
+import time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Ad, AdLSHBucket, AdSignature, ExchangeProposal, SavedSearchMatch
+
+
+def _delete_proposals_chunk(ad_ids, batch_size):
+    # Сырой DELETE: каскадный Collector Django загрузил бы все строки в память
+    table = connection.ops.quote_name(ExchangeProposal._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(ad_ids))
+    sql = (
+        f"DELETE FROM {table} WHERE id IN ("
+        f"SELECT id FROM {table} "
+        f"WHERE ad_sender_id IN ({placeholders}) OR ad_receiver_id IN ({placeholders}) "
+        f"LIMIT %s)"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(sql, [*ad_ids, *ad_ids, batch_size])
+        return cursor.rowcount
+
+
+def _delete_ads(ad_ids):
+    table = connection.ops.quote_name(Ad._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(ad_ids))
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Индекс дублей и совпадения поисков: строк на объявление немного,
+        # удаляем вместе с ним
+        for model in (AdLSHBucket, AdSignature, SavedSearchMatch):
+            cursor.execute(
+                f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)} "
+                f"WHERE ad_id IN ({placeholders})",
+                ad_ids,
+            )
+        cursor.execute(
+            f"DELETE FROM {table} WHERE id IN ({placeholders}) AND deleted_at IS NOT NULL",
+            ad_ids,
+        )
+        return cursor.rowcount
+
+
+def purge_deleted_ads(batch_size=1000, ad_batch_size=100, pause=0.1, max_batches=None, user=None):
+    """Окончательно удаляет мягко удалённые объявления и их предложения.
+
+    Предложения удаляются порциями по batch_size строк, каждая порция — своя
+    короткая транзакция с паузой после неё, затем удаляются сами объявления.
+    С user вычищаются только объявления этого пользователя.
+    Возвращает (удалено объявлений, удалено предложений).
+    """
+    deleted_ads = Ad.all_objects.filter(deleted_at__isnull=False)
+    if user is not None:
+        deleted_ads = deleted_ads.filter(user=user)
+    ads_total = proposals_total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ad_ids = list(
+            deleted_ads
+            .order_by("id")
+            .values_list("id", flat=True)[:ad_batch_size]
+        )
+        if not ad_ids:
+            break
+
+        deleted = _delete_proposals_chunk(ad_ids, batch_size)
+        proposals_total += deleted
+        batches += 1
+        if deleted < batch_size:
+            # Предложений у этих объявлений больше нет — удаляем сами объявления
+            ads_total += _delete_ads(ad_ids)
+        if pause:
+            time.sleep(pause)
+    return ads_total, proposals_total
+
+
+def delete_user(user, batch_size=1000, ad_batch_size=100, pause=0.1):
+    """Удаляет пользователя, не отдавая его объявления каскаду Django.
+
+    Объявления мягко удаляются одним UPDATE и вычищаются порциями как в
+    purge_deleted_ads; к моменту user.delete() каскаду остаются только
+    небольшие таблицы (сохранённые поиски, архив).
+    Возвращает (удалено объявлений, удалено предложений).
+    """
+    Ad.all_objects.filter(user=user, deleted_at__isnull=True).update(deleted_at=timezone.now())
+    result = purge_deleted_ads(batch_size, ad_batch_size, pause, user=user)
+    user.delete()
+    return result
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .dedup import index_ad
+from .models import Ad, SavedSearch
+from .percolator import index_search
+
+
+@receiver(post_save, sender=Ad)
+def update_duplicate_index(sender, instance, update_fields=None, **kwargs):
+    # Сигнатура зависит только от текста объявления
+    if update_fields is not None and not {"title", "description"} & set(update_fields):
+        return
+    index_ad(instance)
+
+
+@receiver(post_save, sender=SavedSearch)
+def update_saved_search_index(sender, instance, **kwargs):
+    index_search(instance)
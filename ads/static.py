@@ -0,0 +1,74 @@
+import mimetypes
+import os
+import posixpath
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_safe
+
+# Хешированные имена не меняются никогда — кешируем на год
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=60"
+
+# Порядок важен: brotli предпочтительнее gzip
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        params = params.strip().replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _is_hashed(name):
+    # У StaticFilesStorage (DEBUG) manifest нет — хешированных имён тоже
+    return name in getattr(staticfiles_storage, "hashed_names", frozenset())
+
+
+@require_safe
+def serve_static(request, path):
+    """Отдаёт собранную статику из STATIC_ROOT с учётом Accept-Encoding."""
+    name = posixpath.normpath(path).lstrip("/")
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    content_type, _ = mimetypes.guess_type(name)
+    accepted = _accepted_encodings(request.headers.get("Accept-Encoding", ""))
+
+    encoding = None
+    for coding, suffix in ENCODINGS:
+        if coding in accepted and os.path.isfile(full_path + suffix):
+            full_path += suffix
+            encoding = coding
+            break
+
+    # Имя задаётся явно: иначе в Content-Disposition попало бы имя .br/.gz-копии
+    response = FileResponse(
+        open(full_path, "rb"),
+        content_type=content_type or "application/octet-stream",
+        filename=posixpath.basename(name),
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    patch_vary_headers(response, ["Accept-Encoding"])
+    response.headers["Cache-Control"] = (
+        IMMUTABLE_CACHE_CONTROL if _is_hashed(name) else DEFAULT_CACHE_CONTROL
+    )
+    return response
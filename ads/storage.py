@@ -0,0 +1,59 @@
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.functional import cached_property
+
+try:
+    import brotli
+except ImportError:  # brotli — необязательная зависимость
+    brotli = None
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хранилище статики с хешированными именами и заранее сжатыми копиями.
+
+    После обычного post_process (хеширование + manifest) рядом с каждым
+    текстовым файлом пишутся ``.gz`` и, если установлен brotli, ``.br``.
+    """
+
+    compressible_extensions = {".css", ".js", ".svg", ".html", ".txt", ".json", ".xml", ".map"}
+
+    @cached_property
+    def hashed_names(self):
+        """Хешированные имена из manifest — для выбора Cache-Control при отдаче."""
+        return frozenset(self.hashed_files.values())
+
+    def post_process(self, paths, dry_run=False, **options):
+        processed = []
+        for name, hashed_name, result in super().post_process(paths, dry_run, **options):
+            processed.append((name, hashed_name))
+            yield name, hashed_name, result
+        # Manifest перезаписан — множество имён строится заново
+        self.__dict__.pop("hashed_names", None)
+
+        if dry_run:
+            return
+
+        for name, hashed_name in processed:
+            for target in {name, hashed_name}:
+                if target and self._is_compressible(target):
+                    self._write_compressed(target)
+
+    def _is_compressible(self, name):
+        return os.path.splitext(name)[1].lower() in self.compressible_extensions
+
+    def _write_compressed(self, name):
+        path = self.path(name)
+        with open(path, "rb") as f:
+            data = f.read()
+
+        variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((".br", brotli.compress(data)))
+
+        for suffix, compressed in variants:
+            # Сжатая копия имеет смысл, только если она действительно меньше
+            if len(compressed) < len(data):
+                with open(path + suffix, "wb") as f:
+                    f.write(compressed)
@@ -14,5 +14,12 @@ urlpatterns = [
     path('proposals/', views.proposal_list, name='proposal_list'),
     path('proposals/create/', views.proposal_create, name='proposal_create'),
     path('proposals/<int:proposal_id>/update/', views.proposal_update, name='proposal_update'),
+    path('proposals/archive/', views.proposal_archive, name='proposal_archive'),
+
+    path('searches/', views.saved_search_list, name='saved_search_list'),
+    path('searches/create/', views.saved_search_create, name='saved_search_create'),
+    path('searches/<int:search_id>/delete/', views.saved_search_delete, name='saved_search_delete'),
+
+    path('metrics/', views.metrics_dashboard, name='metrics_dashboard'),
 
 ]
@@ -1,13 +1,26 @@
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.http import HttpResponseForbidden
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import login
-from .models import Ad, ExchangeProposal
-from .forms import AdForm, ExchangeProposalForm
+from .models import (
+    Ad, ArchivedAd, ArchivedExchangeProposal, ExchangeProposal, SavedSearch, SavedSearchMatch
+)
+from .forms import AdForm, ExchangeProposalForm, SavedSearchForm
+from .geo import filter_near, parse_near
+from .metrics import dashboard_rows, record_event
+
+PROPOSAL_STATUS_FILTER_CHOICES = [
+    ("pending", "Ожидает"),
+    ("accepted", "Принято"),
+    ("rejected", "Отклонено"),
+]
 
 
 def signup(request):
@@ -30,7 +43,7 @@ def ad_list(request):
     query = request.GET.get("q")
     category = request.GET.get("category")
     condition = request.GET.get("condition")
-    ads = Ad.objects.all()
+    ads = Ad.objects.active()
 
     if query:
         ads = ads.filter(Q(title__icontains=query) | Q(description__icontains=query))
@@ -39,20 +52,29 @@ def ad_list(request):
     if condition:
         ads = ads.filter(condition=condition)
 
+    # Поиск рядом: ?near=lat,lng&radius=km
+    near = parse_near(request.GET.get("near"), request.GET.get("radius"))
+    if near:
+        ads = filter_near(ads, *near)
+
     paginator = Paginator(ads.order_by('-created_at'), 10)
     page_number = request.GET.get("page")
     page_obj = paginator.get_page(page_number)
-    return render(request, "ad/list.html", {"page_obj": page_obj})
+    return render(request, "ad/list.html", {
+        "page_obj": page_obj,
+        "can_save_search": request.user.is_authenticated and bool(query or category or condition),
+    })
 
 
 # Создание объявления
 @login_required
 def ad_create(request):
     if request.method == "POST":
-        form = AdForm(request.POST)
+        form = AdForm(request.POST, user=request.user)
         if form.is_valid():
             ad = form.save(commit=False)
             ad.user = request.user
+            # Сохранённые поиски проверяются в фоне командой match_saved_searches
             ad.save()
             return redirect("ad_detail", ad.id)
     else:
@@ -79,7 +101,8 @@ def ad_edit(request, ad_id):
 def ad_delete(request, ad_id):
     ad = get_object_or_404(Ad, id=ad_id, user=request.user)
     if request.method == "POST":
-        ad.delete()
+        # Предложения вычищаются позже командой purge_deleted_ads
+        ad.soft_delete()
         return redirect("ad_list")
     return render(request, "ad/confirm_delete.html", {"ad": ad})
 
@@ -94,14 +117,16 @@ def ad_detail(request, ad_id):
 @login_required
 def proposal_create(request):
     ad_receiver_id = request.GET.get("ad_receiver_id")
-    ad_receiver = Ad.objects.filter(id=ad_receiver_id).first()
+    ad_receiver = Ad.objects.active().filter(id=ad_receiver_id).first()
 
     if request.method == "POST":
         form = ExchangeProposalForm(request.POST)
         if form.is_valid():
             proposal = form.save(commit=False)
             proposal.status = "pending"
-            proposal.save()
+            with transaction.atomic():
+                proposal.save()
+                record_event(proposal)
             messages.success(request, "Предложение успешно отправлено.")
             return redirect("proposal_list")
         else:
@@ -109,7 +134,7 @@ def proposal_create(request):
     else:
         form = ExchangeProposalForm(initial={'ad_receiver': ad_receiver})
 
-    user_ads = Ad.objects.filter(user=request.user)
+    user_ads = Ad.objects.active().filter(user=request.user)
 
     return render(request, "proposal/form.html", {
         "form": form,
@@ -122,7 +147,9 @@ def proposal_create(request):
 def proposal_list(request):
     # Получаем все предложения, где пользователь — отправитель или получатель
     proposals = ExchangeProposal.objects.filter(
-        Q(ad_sender__user=request.user) | Q(ad_receiver__user=request.user)
+        Q(ad_sender__user=request.user) | Q(ad_receiver__user=request.user),
+        ad_sender__deleted_at__isnull=True,
+        ad_receiver__deleted_at__isnull=True,
     ).select_related("ad_sender", "ad_receiver")
 
     # Фильтрация
@@ -147,15 +174,54 @@ def proposal_list(request):
 
     return render(request, "proposal/list.html", {
         "proposals": proposals,
-        "user_ads": user_ads,  # для фильтра "Что я предлагаю"
-        "other_ads": other_ads,  # для фильтра "Что хочу получить"
+        "status_options": _status_options(status),
+        "sender_options": _ad_options(user_ads, sender_id, 20),  # для фильтра "Что я предлагаю"
+        "receiver_options": _ad_options(other_ads, receiver_id, 15),  # для фильтра "Что хочу получить"
         "request": request,
     })
 
 
+def _status_options(selected):
+    return [
+        {"value": value, "label": label, "selected": value == selected}
+        for value, label in PROPOSAL_STATUS_FILTER_CHOICES
+    ]
+
+
+def _ad_options(ads, selected_id, max_length):
+    # Форматирование подписей делается здесь, а не фильтрами в шаблоне на каждую строку
+    options = []
+    for ad_id, title in ads.values_list("id", "title"):
+        if len(title) > max_length:
+            title = title[:max_length] + "..."
+        options.append({"value": ad_id, "label": title, "selected": str(ad_id) == selected_id})
+    return options
+
+
+# Архив (только чтение)
+@login_required
+def proposal_archive(request):
+    proposals = ArchivedExchangeProposal.objects.filter(
+        Q(sender_user=request.user) | Q(receiver_user=request.user)
+    ).order_by("-created_at")
+    ads = ArchivedAd.objects.filter(user=request.user).order_by("-created_at")
+
+    paginator = Paginator(proposals, 20)
+    page_obj = paginator.get_page(request.GET.get("page"))
+    return render(request, "proposal/archive.html", {
+        "page_obj": page_obj,
+        "archived_ads": ads,
+    })
+
+
 @login_required
 def proposal_update(request, proposal_id):
-    proposal = get_object_or_404(ExchangeProposal, id=proposal_id)
+    proposal = get_object_or_404(
+        ExchangeProposal,
+        id=proposal_id,
+        ad_sender__deleted_at__isnull=True,
+        ad_receiver__deleted_at__isnull=True,
+    )
 
     # Только получатель может менять статус
     if proposal.ad_receiver.user != request.user:
@@ -163,7 +229,76 @@ def proposal_update(request, proposal_id):
 
     if request.method == "POST":
         status = request.POST.get("status")
-        if status in ["accepted", "rejected"]:
-            proposal.status = status
-            proposal.save()
+        # Закрытое предложение не переоткрывается: иначе объявления остались бы traded
+        if status in ["accepted", "rejected"] and proposal.status == "pending":
+            ad_ids = [proposal.ad_sender_id, proposal.ad_receiver_id]
+            with transaction.atomic():
+                # Условные UPDATE: из двух одновременных запросов пройдёт только один
+                claimed = ExchangeProposal.objects.filter(
+                    id=proposal.id, status="pending"
+                ).update(status=status)
+                traded = 2
+                if claimed and status == "accepted":
+                    traded = Ad.objects.active().filter(id__in=ad_ids).update(
+                        status="traded", updated_at=timezone.now()
+                    )
+                if not claimed or traded < 2:
+                    transaction.set_rollback(True)
+                else:
+                    proposal.status = status
+                    record_event(proposal, "pending")
+            if not claimed:
+                messages.error(request, "Предложение уже обработано.")
+            elif traded < 2:
+                messages.error(request, "Одно из объявлений уже обменяно или снято с публикации.")
     return redirect("proposal_list")
+
+
+# Метрики для операторов: читаются только дневные агрегаты (см. rollup_metrics)
+@staff_member_required
+def metrics_dashboard(request):
+    try:
+        days = min(max(int(request.GET.get("days", 30)), 1), 365)
+    except ValueError:
+        days = 30
+    return render(request, "metrics/dashboard.html", {
+        "rows": dashboard_rows(days),
+        "days": days,
+    })
+
+
+# Сохранённые поиски
+@login_required
+def saved_search_list(request):
+    searches = SavedSearch.objects.filter(user=request.user).order_by("-created_at")
+    matches = SavedSearchMatch.objects.filter(
+        search__user=request.user, ad__deleted_at__isnull=True
+    ).select_related("ad", "search").order_by("-created_at")[:50]
+    return render(request, "search/list.html", {
+        "searches": searches,
+        "matches": matches,
+    })
+
+
+@login_required
+def saved_search_create(request):
+    if request.method == "POST":
+        form = SavedSearchForm(request.POST)
+        if form.is_valid():
+            search = form.save(commit=False)
+            search.user = request.user
+            search.save()
+            messages.success(request, "Поиск сохранён. Мы сообщим о новых объявлениях.")
+        else:
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
+    return redirect("saved_search_list")
+
+
+@login_required
+def saved_search_delete(request, search_id):
+    search = get_object_or_404(SavedSearch, id=search_id, user=request.user)
+    if request.method == "POST":
+        search.delete()
+    return redirect("saved_search_list")
@@ -6,9 +6,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
 
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "True").lower() in ("1", "true", "yes")
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host]
 
 
 # Application definition
@@ -34,21 +34,56 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'barter_platform.urls'
 
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [os.path.join(BASE_DIR, "templates")],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
+TEMPLATE_CONTEXT_PROCESSORS = [
+    'django.template.context_processors.request',
+    'django.contrib.auth.context_processors.auth',
+    'django.contrib.messages.context_processors.messages',
 ]
 
+DJANGO_TEMPLATES = {
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': [os.path.join(BASE_DIR, "templates")],
+    'APP_DIRS': True,
+    'OPTIONS': {
+        'context_processors': TEMPLATE_CONTEXT_PROCESSORS,
+    },
+}
+
+# Продакшен-профиль: явный кеширующий загрузчик, без отладочной информации шаблонов
+DJANGO_TEMPLATES_PRODUCTION = {
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': [os.path.join(BASE_DIR, "templates")],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        'context_processors': TEMPLATE_CONTEXT_PROCESSORS,
+        'debug': False,
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}
+
+# Необязательный бэкенд Jinja2 с портами шаблонов ad/ и proposal/
+JINJA2_TEMPLATES = {
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [os.path.join(BASE_DIR, "templates", "jinja2")],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        'environment': 'barter_platform.jinja2.environment',
+        'context_processors': TEMPLATE_CONTEXT_PROCESSORS,
+    },
+}
+
+TEMPLATE_BACKEND = os.getenv("TEMPLATE_BACKEND", "django")
+
+TEMPLATES = [DJANGO_TEMPLATES if DEBUG else DJANGO_TEMPLATES_PRODUCTION]
+if TEMPLATE_BACKEND == "jinja2":
+    # Jinja2 идёт первым; шаблоны без порта (registration/) берутся из Django
+    TEMPLATES.insert(0, JINJA2_TEMPLATES)
+
 WSGI_APPLICATION = 'barter_platform.wsgi.application'
 
 
@@ -91,9 +126,27 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# В продакшене collectstatic хеширует имена файлов и сохраняет gzip/brotli-копии
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "ads.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Срок жизни объявления; истёкшие переводит в expired команда expire_ads
+AD_LIFETIME_DAYS = int(os.getenv("AD_LIFETIME_DAYS", "30"))
+
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
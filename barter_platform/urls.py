@@ -1,8 +1,18 @@
+import re
+
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+
+from ads.static import serve_static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('ads.urls')),
     path('accounts/', include('django.contrib.auth.urls')),
+    re_path(
+        r'^%s(?P<path>.*)$' % re.escape(settings.STATIC_URL.lstrip('/')),
+        serve_static,
+        name='static',
+    ),
 ]
@@ -0,0 +1,88 @@
+"""Бенчмарк детектора почти-дублей.
+
+Заполняет временную базу N объявлениями со случайными текстами, строит
+индекс командой dedupe_ads (векторизованный MinHash пачками) и измеряет
+задержку проверки одного объявления, как в AdForm.clean().
+
+Запуск:
+    python benchmarks/bench_dedup.py [--count 100000] [--queries 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "barter_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from ads import dedup  # noqa: E402
+from ads.models import Ad  # noqa: E402
+
+VOCABULARY = [f"слово{i}" for i in range(5000)]
+
+
+def random_text(rnd, words):
+    return " ".join(rnd.choices(VOCABULARY, k=words))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        rnd = random.Random(0)
+        user = User.objects.create(username="bench")
+        texts = [(random_text(rnd, 4), random_text(rnd, 40)) for _ in range(args.count)]
+        for start in range(0, args.count, 10_000):
+            Ad.objects.bulk_create([
+                Ad(user=user, title=title, description=description, category="B", condition="used")
+                for title, description in texts[start:start + 10_000]
+            ])
+
+        start = time.perf_counter()
+        dedup.signatures(texts)
+        elapsed = time.perf_counter() - start
+        print(f"MinHash пачкой: {args.count / elapsed:,.0f} объявлений/с")
+
+        start = time.perf_counter()
+        call_command("dedupe_ads", "--dry-run", stdout=StringIO())
+        print(f"dedupe_ads на {args.count} объявлениях: {time.perf_counter() - start:.1f} с")
+
+        sample = rnd.sample(texts, args.queries)
+        cases = {
+            # новый уникальный текст — основной случай при создании объявления
+            "уникальное": [(random_text(rnd, 4), random_text(rnd, 40)) for _ in sample],
+            # повтор с небольшой правкой
+            "повтор": [(title, description + " " + random_text(rnd, 1)) for title, description in sample],
+        }
+        for name, queries in cases.items():
+            start = time.perf_counter()
+            found = sum(
+                dedup.find_duplicate(title, description, user=user) is not None
+                for title, description in queries
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"Проверка ({name}): {elapsed / len(queries) * 1000:.3f} мс на объявление, "
+                f"дублей найдено {found} из {len(queries)}"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Бенчмарк поиска объявлений по расстоянию на SQLite.
+
+Заполняет временную базу N объявлениями (по умолчанию 1 000 000) вокруг
+нескольких городов и сравнивает filter_near (ячейки geohash + haversine)
+с полным проходом, где haversine считается для каждой строки.
+
+Запуск:
+    python benchmarks/bench_geo.py [--count 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "barter_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from ads import geo  # noqa: E402
+from ads.models import Ad  # noqa: E402
+
+CITIES = [
+    (55.7558, 37.6173),  # Москва
+    (59.9343, 30.3351),  # Санкт-Петербург
+    (56.8389, 60.6057),  # Екатеринбург
+    (55.0084, 82.9357),  # Новосибирск
+    (43.5855, 39.7231),  # Сочи
+]
+RADII = [1, 10, 50]
+
+
+def populate(count, chunk=50_000):
+    user = User.objects.create(username="bench")
+    rnd = random.Random(0)
+    now = timezone.now()
+    expires_at = now + timedelta(days=settings.AD_LIFETIME_DAYS)
+    # Все NOT NULL-колонки без значения по умолчанию в БД перечисляются явно
+    columns = [
+        "user_id", "title", "description", "category", "condition",
+        "latitude", "longitude", "geohash", "created_at", "updated_at",
+        "searches_matched", "status", "expires_at",
+    ]
+    sql = (
+        f"INSERT INTO {Ad._meta.db_table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    with connection.cursor() as cursor:
+        for start in range(0, count, chunk):
+            rows = []
+            for _ in range(min(chunk, count - start)):
+                city_lat, city_lng = rnd.choice(CITIES)
+                lat = city_lat + rnd.gauss(0, 0.5)
+                lng = city_lng + rnd.gauss(0, 0.8)
+                rows.append((
+                    user.id, "Ad", "", "Books", "used",
+                    lat, lng, geo.encode(lat, lng), now, now,
+                    True, "active", expires_at,
+                ))
+            with transaction.atomic():
+                cursor.executemany(sql, rows)
+        cursor.execute("ANALYZE")
+
+
+def timed(queryset, repeat):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = queryset.count()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        populate(args.count)
+        print(f"Заполнено {args.count} объявлений за {time.perf_counter() - start:.1f} с")
+
+        lat, lng = CITIES[0]
+        plan_qs = geo.filter_near(Ad.objects.all(), lat, lng, 10)
+        sql, params = plan_qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            print("План:", "; ".join(row[-1] for row in cursor.fetchall()))
+
+        print(f"{'radius, km':>10}{'found':>10}{'cells, ms':>12}{'full scan, ms':>15}")
+        for radius in RADII:
+            near_ms, found = timed(geo.filter_near(Ad.objects.all(), lat, lng, radius), args.repeat)
+            full_qs = Ad.objects.annotate(
+                distance_km=geo.haversine_expression(lat, lng)
+            ).filter(distance_km__lte=radius)
+            full_ms, full_found = timed(full_qs, 1)
+            assert found == full_found, (found, full_found)
+            print(f"{radius:>10}{found:>10}{near_ms:>12.1f}{full_ms:>15.1f}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Бенчмарк сопоставления новых объявлений с сохранёнными поисками.
+
+Заполняет временную базу N сохранёнными поисками (по умолчанию 10**6),
+индексирует их так же, как index_search, и измеряет время match_ad на одно
+объявление. Для сравнения — полный перебор всех поисков функцией matches.
+
+Запуск:
+    python benchmarks/bench_saved_search.py [--searches 1000000] [--ads 200]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "barter_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from ads import percolator  # noqa: E402
+from ads.models import Ad, SavedSearch, SavedSearchTerm  # noqa: E402
+
+def make_vocabulary(rnd, size):
+    return [
+        "".join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 9)))
+        for _ in range(size)
+    ]
+
+
+def random_search(rnd, vocabulary, categories):
+    # Большинство поисков — по тексту; поиски только по категории или
+    # состоянию подходят многим объявлениям и встречаются реже
+    kind = rnd.random()
+    if kind < 0.95:
+        query = " ".join(rnd.sample(vocabulary, rnd.choice([1, 1, 2])))
+        return query, rnd.choice(["", "", rnd.choice(categories)]), rnd.choice(["", "", "new", "used"])
+    if kind < 0.999:
+        return "", rnd.choice(categories), rnd.choice(["", "new", "used"])
+    return "", "", rnd.choice(["new", "used"])
+
+
+def populate(rnd, vocabulary, categories, count, chunk=50_000):
+    user = User.objects.create(username="bench")
+    now = timezone.now()
+    counts = {}
+    search_table = connection.ops.quote_name(SavedSearch._meta.db_table)
+    term_table = connection.ops.quote_name(SavedSearchTerm._meta.db_table)
+    next_id = 1
+    with connection.cursor() as cursor:
+        for start in range(0, count, chunk):
+            searches, terms = [], []
+            for _ in range(min(chunk, count - start)):
+                query, category, condition = random_search(rnd, vocabulary, categories)
+                key = percolator.pick_key(percolator.search_keys(query, category, condition), counts)
+                counts[key] = counts.get(key, 0) + 1
+                searches.append((next_id, user.id, query, category, condition, now))
+                terms.append((next_id, key))
+                next_id += 1
+            with transaction.atomic():
+                cursor.executemany(
+                    f"INSERT INTO {search_table} (id, user_id, query, category, condition, created_at) "
+                    "VALUES (%s, %s, %s, %s, %s, %s)",
+                    searches,
+                )
+                cursor.executemany(
+                    f"INSERT INTO {term_table} (search_id, key) VALUES (%s, %s)", terms
+                )
+        cursor.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=1_000_000)
+    parser.add_argument("--ads", type=int, default=200)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        rnd = random.Random(0)
+        vocabulary = make_vocabulary(rnd, 20_000)
+        categories = make_vocabulary(rnd, 200)
+        start = time.perf_counter()
+        populate(rnd, vocabulary, categories, args.searches)
+        print(f"Заполнено {args.searches} поисков за {time.perf_counter() - start:.1f} с")
+
+        seller = User.objects.create(username="seller")
+        ads = [
+            Ad.objects.create(
+                user=seller,
+                title=" ".join(rnd.sample(vocabulary, 4)),
+                description=" ".join(rnd.sample(vocabulary, 30)),
+                category=rnd.choice(categories),
+                condition=rnd.choice(["new", "used"]),
+            )
+            for _ in range(args.ads)
+        ]
+
+        candidates = sum(len(percolator.candidate_search_ids(ad)) for ad in ads)
+        start = time.perf_counter()
+        matched = sum(len(percolator.match_ad(ad)) for ad in ads)
+        elapsed = time.perf_counter() - start
+        print(
+            f"match_ad: {elapsed / args.ads * 1000:.1f} мс на объявление "
+            f"(кандидатов в среднем {candidates / args.ads:.0f}, совпадений {matched / args.ads:.1f})"
+        )
+
+        searches = list(SavedSearch.objects.all())
+        start = time.perf_counter()
+        for ad in ads[:3]:
+            [search for search in searches if percolator.matches(search, ad)]
+        print(f"Полный перебор: {(time.perf_counter() - start) / 3 * 1000:.1f} мс на объявление")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
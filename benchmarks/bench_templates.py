@@ -0,0 +1,108 @@
+"""Бенчмарк рендеринга страниц ad_list и proposal_list.
+
+Рендерит каждую страницу на 10/100/1000 строк в каждом бэкенде шаблонов
+(Django с кеширующим загрузчиком и Jinja2). База данных не нужна: объекты
+моделей создаются в памяти.
+
+Запуск:
+    python benchmarks/bench_templates.py [--repeat 20]
+"""
+import argparse
+import copy
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "barter_platform.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.paginator import Paginator  # noqa: E402
+from django.template.utils import EngineHandler  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from ads.models import Ad, ExchangeProposal  # noqa: E402
+from ads.views import _ad_options, _status_options  # noqa: E402
+
+ROWS = [10, 100, 1000]
+
+
+class _Options(list):
+    """Подмена QuerySet для _ad_options: values_list без обращения к БД."""
+
+    def values_list(self, *fields):
+        return [tuple(getattr(ad, f) for f in fields) for ad in self]
+
+
+def _engines():
+    handler = EngineHandler([
+        dict(copy.deepcopy(settings.DJANGO_TEMPLATES_PRODUCTION), NAME="django"),
+        dict(copy.deepcopy(settings.JINJA2_TEMPLATES), NAME="jinja2"),
+    ])
+    return {name: handler[name] for name in ("django", "jinja2")}
+
+
+def _make_ads(user, other, n):
+    return [
+        Ad(
+            id=i,
+            user=user if i % 2 else other,
+            title=f"Объявление номер {i} с довольно длинным названием",
+            description="desc",
+            category="Books",
+            condition="used",
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def _contexts(n):
+    user = User(id=1, username="bench")
+    other = User(id=2, username="other")
+    ads = _make_ads(user, other, n)
+    proposals = [
+        ExchangeProposal(id=i, ad_sender=ads[i - 1], ad_receiver=ads[-i], comment="swap?", status="pending")
+        for i in range(1, n + 1)
+    ]
+
+    request = RequestFactory().get("/", {"sender": "3"})
+    request.user = user
+
+    ad_list = {"page_obj": Paginator(ads, n).get_page(1), "user": user}
+    proposal_list = {
+        "proposals": proposals,
+        "status_options": _status_options(None),
+        "sender_options": _ad_options(_Options(ads), "3", 20),
+        "receiver_options": _ad_options(_Options(ads), None, 15),
+        "user": user,
+    }
+    return request, {"ad/list.html": ad_list, "proposal/list.html": proposal_list}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engines = _engines()
+    print(f"{'template':<22}{'rows':>6}" + "".join(f"{name + ', ms':>14}" for name in engines))
+    for n in ROWS:
+        request, contexts = _contexts(n)
+        for template_name, context in contexts.items():
+            timings = []
+            for engine in engines.values():
+                template = engine.get_template(template_name)
+                template.render(dict(context), request)  # прогрев
+                seconds = timeit.timeit(lambda: template.render(dict(context), request), number=args.repeat)
+                timings.append(seconds / args.repeat * 1000)
+            print(f"{template_name:<22}{n:>6}" + "".join(f"{t:>14.2f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ads.archive import archive_ads, archive_proposals
+from ads.models import Ad, ArchivedAd, ArchivedExchangeProposal, ExchangeProposal
+
+
+class ArchiveTest(TestCase):
+    def setUp(self):
+        """Создаёт двух пользователей, их объявления и старые предложения."""
+        self.user1 = User.objects.create_user(username="u1", password="pass")
+        self.user2 = User.objects.create_user(username="u2", password="pass")
+        self.ad1 = Ad.objects.create(
+            user=self.user1, title="A1", description="D1", category="Books", condition="new"
+        )
+        self.ad2 = Ad.objects.create(
+            user=self.user2, title="A2", description="D2", category="Toys", condition="used"
+        )
+        self.old = timezone.now() - timedelta(days=400)
+
+    def _proposal(self, status, created_at):
+        proposal = ExchangeProposal.objects.create(
+            ad_sender=self.ad1, ad_receiver=self.ad2, comment="hi", status=status
+        )
+        ExchangeProposal.objects.filter(id=proposal.id).update(created_at=created_at)
+        return proposal
+
+    def test_archive_closed_proposals(self):
+        """Проверяет, что в архив уходят только старые закрытые предложения."""
+        accepted = self._proposal("accepted", self.old)
+        pending = self._proposal("pending", self.old)
+        recent = self._proposal("rejected", timezone.now())
+
+        moved = archive_proposals(older_than_days=365, pause=0)
+
+        self.assertEqual(moved, 1)
+        self.assertFalse(ExchangeProposal.objects.filter(id=accepted.id).exists())
+        self.assertEqual(ExchangeProposal.objects.filter(id__in=[pending.id, recent.id]).count(), 2)
+        archived = ArchivedExchangeProposal.objects.get(id=accepted.id)
+        self.assertEqual(archived.ad_sender_title, "A1")
+        self.assertEqual(archived.receiver_user, self.user2)
+        self.assertEqual(archived.created_at, self.old)
+
+    def test_archive_in_bounded_batches(self):
+        """Проверяет, что за один запуск переносится не больше max_batches порций."""
+        for _ in range(5):
+            self._proposal("rejected", self.old)
+
+        moved = archive_proposals(older_than_days=365, batch_size=2, pause=0, max_batches=2)
+
+        self.assertEqual(moved, 4)
+        self.assertEqual(ExchangeProposal.objects.count(), 1)
+
+    def test_archive_inactive_ads(self):
+        """Проверяет, что в архив уходят давно снятые с каталога объявления без ожидающих предложений."""
+        long_ago = timezone.now() - timedelta(days=100)
+        accepted = self._proposal("accepted", timezone.now())
+        Ad.objects.filter(id__in=[self.ad1.id, self.ad2.id]).update(
+            status="traded", updated_at=long_ago
+        )
+        waiting = Ad.objects.create(
+            user=self.user1, title="A3", description="D3", category="Music", condition="used"
+        )
+        ExchangeProposal.objects.create(ad_sender=waiting, ad_receiver=self.ad2, status="pending")
+        recent = Ad.objects.create(
+            user=self.user1, title="A4", description="D4", category="Music", condition="used"
+        )
+        Ad.objects.filter(id=recent.id).update(status="expired")
+        active = Ad.objects.create(
+            user=self.user2, title="A5", description="D5", category="Music", condition="used"
+        )
+        Ad.objects.filter(id__in=[waiting.id, active.id]).update(updated_at=long_ago)
+        Ad.objects.filter(id=waiting.id).update(status="expired")
+
+        moved = archive_ads(older_than_days=90, pause=0)
+
+        # ad2 ждёт ответа на предложение от waiting, поэтому остаётся
+        self.assertEqual(moved, 1)
+        self.assertTrue(ArchivedAd.objects.filter(id=self.ad1.id, title="A1").exists())
+        self.assertTrue(ArchivedExchangeProposal.objects.filter(id=accepted.id).exists())
+        self.assertEqual(
+            set(Ad.objects.values_list("id", flat=True)),
+            {self.ad2.id, waiting.id, recent.id, active.id},
+        )
+
+    def test_archive_command(self):
+        """Проверяет запуск management-команды archive."""
+        self._proposal("accepted", self.old)
+        out = StringIO()
+        call_command("archive", "--pause", "0", stdout=out)
+        self.assertIn("предложений — 1", out.getvalue())
+        self.assertEqual(ArchivedExchangeProposal.objects.count(), 1)
+
+    def test_archive_view(self):
+        """Проверяет, что участник видит архивные предложения, а посторонний — нет."""
+        self._proposal("accepted", self.old)
+        archive_proposals(older_than_days=365, pause=0)
+
+        self.client.login(username="u2", password="pass")
+        response = self.client.get(reverse("proposal_archive"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "A1")
+        self.assertContains(response, "Принята")
+
+        User.objects.create_user(username="u3", password="pass")
+        self.client.login(username="u3", password="pass")
+        response = self.client.get(reverse("proposal_archive"))
+        self.assertContains(response, "В архиве нет предложений.")
@@ -0,0 +1,142 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ads import dedup
+from ads.forms import AdForm
+from ads.management.commands import dedupe_ads
+from ads.models import Ad, AdLSHBucket, AdSignature
+
+DESCRIPTION = (
+    "Продаю велосипед горный в отличном состоянии, колёса 26 дюймов, "
+    "алюминиевая рама, дисковые тормоза, 21 скорость, обслужен весной"
+)
+
+
+class MinHashTest(TestCase):
+    def test_similar_texts_have_close_signatures(self):
+        """Проверяет, что небольшая правка текста почти не меняет сигнатуру."""
+        sig = dedup.signature("Велосипед", DESCRIPTION)
+        edited = dedup.signature("Велосипед", DESCRIPTION + " срочно")
+        other = dedup.signature("Книга", "Сборник стихов Пушкина, твёрдый переплёт")
+        self.assertGreaterEqual(dedup.similarity(sig, edited), 0.8)
+        self.assertLess(dedup.similarity(sig, other), 0.2)
+
+    def test_batch_matches_single(self):
+        """Проверяет, что пакетный расчёт совпадает с расчётом по одному тексту."""
+        texts = [("Велосипед", DESCRIPTION), ("Книга", "Стихи"), ("A", "")]
+        batch = dedup.signatures(texts)
+        for (title, description), sig in zip(texts, batch):
+            self.assertTrue((dedup.signature(title, description) == sig).all())
+
+    def test_index_written_on_save(self):
+        """Проверяет, что при сохранении объявления пишется сигнатура и корзины."""
+        user = User.objects.create_user(username="u1")
+        ad = Ad.objects.create(
+            user=user, title="Велосипед", description=DESCRIPTION, category="Sport", condition="used"
+        )
+        self.assertTrue(AdSignature.objects.filter(ad=ad).exists())
+        self.assertEqual(AdLSHBucket.objects.filter(ad=ad).count(), dedup.BANDS)
+
+
+class DuplicateFormTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1", password="pass")
+        self.other = User.objects.create_user(username="u2", password="pass")
+        self.ad = Ad.objects.create(
+            user=self.user, title="Велосипед", description=DESCRIPTION, category="Sport", condition="used"
+        )
+        self.data = {
+            "title": "Велосипед",
+            "description": DESCRIPTION + " срочно",
+            "category": "Sport",
+            "condition": "used",
+        }
+
+    def test_repost_rejected(self):
+        """Проверяет, что повтор своего объявления не проходит валидацию."""
+        form = AdForm(data=self.data, user=self.user)
+        self.assertFalse(form.is_valid())
+        self.assertIn("Похожее объявление", form.errors["__all__"][0])
+
+    def test_other_user_allowed(self):
+        """Проверяет, что похожее объявление другого продавца допустимо."""
+        self.assertTrue(AdForm(data=self.data, user=self.other).is_valid())
+
+    def test_repost_after_expiry_allowed(self):
+        """Проверяет, что истёкшее объявление можно выставить заново."""
+        Ad.objects.filter(id=self.ad.id).update(status="expired")
+        self.assertTrue(AdForm(data=self.data, user=self.user).is_valid())
+
+    def test_no_owner_skips_check(self):
+        """Проверяет, что форма без владельца не сверяется с объявлениями чужих продавцов."""
+        self.assertTrue(AdForm(data=self.data).is_valid())
+
+    def test_edit_not_compared_with_itself(self):
+        """Проверяет, что при редактировании объявление не считается дублем самого себя."""
+        self.assertTrue(AdForm(data=self.data, instance=self.ad).is_valid())
+
+    def test_deleted_ad_ignored(self):
+        """Проверяет, что удалённые объявления не считаются дублями."""
+        self.ad.soft_delete()
+        self.assertTrue(AdForm(data=self.data, user=self.user).is_valid())
+
+    def test_create_view_rejects_repost(self):
+        """Проверяет, что ad_create не сохраняет повтор."""
+        self.client.login(username="u1", password="pass")
+        response = self.client.post(reverse("ad_create"), self.data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Ad.objects.count(), 1)
+
+
+class DedupeCommandTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1")
+        self.other = User.objects.create_user(username="u2")
+        # bulk_create обходит сигналы — как каталог, созданный до появления индекса
+        self.ads = Ad.objects.bulk_create([
+            Ad(user=self.user, title="Велосипед", description=DESCRIPTION + suffix,
+               category="Sport", condition="used")
+            for suffix in ("", " срочно", " торг")
+        ] + [
+            Ad(user=self.other, title="Велосипед", description=DESCRIPTION,
+               category="Sport", condition="used"),
+            Ad(user=self.user, title="Книга", description="Сборник стихов",
+               category="Books", condition="new"),
+        ])
+
+    def test_dry_run(self):
+        """Проверяет, что --dry-run строит индекс, но ничего не скрывает."""
+        out = StringIO()
+        call_command("dedupe_ads", "--dry-run", stdout=out)
+        self.assertIn("дублей найдено: 2", out.getvalue())
+        self.assertEqual(Ad.objects.count(), 5)
+        self.assertEqual(AdSignature.objects.count(), 5)
+
+    def test_dedupe_keeps_earliest(self):
+        """Проверяет, что остаётся самое раннее объявление продавца, остальные скрыты."""
+        call_command("dedupe_ads", "--batch-size", "2", stdout=StringIO())
+        remaining = set(Ad.objects.values_list("id", flat=True))
+        self.assertEqual(remaining, {self.ads[0].id, self.ads[3].id, self.ads[4].id})
+
+    def test_dedupe_keeps_active_copy(self):
+        """Проверяет, что истёкший оригинал не вытесняет активную копию."""
+        Ad.objects.filter(id=self.ads[0].id).update(status="expired")
+        call_command("dedupe_ads", stdout=StringIO())
+        remaining = set(Ad.objects.active().values_list("id", flat=True))
+        self.assertEqual(remaining, {self.ads[1].id, self.ads[3].id, self.ads[4].id})
+
+    def test_hide_in_batches(self):
+        """Проверяет, что дубли скрываются порциями, а поиск групп — одним запросом."""
+        call_command("dedupe_ads", "--dry-run", stdout=StringIO())
+        command = dedupe_ads.Command()
+        with self.assertNumQueries(1):
+            self.assertEqual(len(command.find_duplicates(dedup.DUPLICATE_THRESHOLD)), 2)
+
+        with mock.patch.object(dedupe_ads, "UPDATE_BATCH_SIZE", 1):
+            call_command("dedupe_ads", stdout=StringIO())
+        self.assertEqual(Ad.objects.count(), 3)
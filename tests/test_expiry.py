@@ -0,0 +1,129 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ads.lifecycle import expire_ads
+from ads.forms import AdForm
+from ads.models import Ad, ExchangeProposal
+
+
+class AdLifecycleTest(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="pass")
+        self.other = User.objects.create_user(username="other", password="pass")
+        self.ad = self._ad("Велосипед", self.owner)
+        self.other_ad = self._ad("Самокат", self.other)
+
+    def _ad(self, title, user):
+        return Ad.objects.create(
+            user=user, title=title, description="desc", category="Sport", condition="used"
+        )
+
+    def _expire(self, ad):
+        Ad.objects.filter(id=ad.id).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+    def test_new_ad_gets_expiry(self):
+        """Проверяет, что новое объявление активно и получает срок размещения."""
+        self.assertEqual(self.ad.status, "active")
+        self.assertGreater(self.ad.expires_at, timezone.now() + timedelta(days=29))
+
+    def test_expire_ads_in_batches(self):
+        """Проверяет, что команда переводит в expired только объявления с истёкшим сроком."""
+        extra = [self._ad(f"Ад {i}", self.owner) for i in range(4)]
+        for ad in [self.ad, *extra]:
+            self._expire(ad)
+
+        self.assertEqual(expire_ads(batch_size=2, pause=0, max_batches=1), 2)
+        call_command("expire_ads", "--pause=0", stdout=StringIO())
+
+        self.assertEqual(Ad.objects.filter(status="expired").count(), 5)
+        self.assertEqual(Ad.objects.get(id=self.other_ad.id).status, "active")
+
+    def test_ad_list_shows_only_active(self):
+        """Проверяет, что в списке объявлений нет истёкших и обменянных объявлений."""
+        self._expire(self.ad)
+        expire_ads(pause=0)
+        traded = self._ad("Ролики", self.other)
+        Ad.objects.filter(id=traded.id).update(status="traded")
+
+        response = self.client.get(reverse("ad_list"))
+        titles = [ad.title for ad in response.context["page_obj"]]
+        self.assertEqual(titles, ["Самокат"])
+
+    def test_proposal_create_rejects_inactive_ads(self):
+        """Проверяет, что предложить обмен на неактивное объявление нельзя."""
+        Ad.objects.filter(id=self.other_ad.id).update(status="expired")
+        self.client.login(username="owner", password="pass")
+
+        response = self.client.get(reverse("proposal_create") + f"?ad_receiver_id={self.other_ad.id}")
+        self.assertIsNone(response.context["form"].initial["ad_receiver"])
+
+        self.client.post(reverse("proposal_create"), {
+            "ad_sender": self.ad.id, "ad_receiver": self.other_ad.id, "comment": "c",
+        })
+        self.assertFalse(ExchangeProposal.objects.exists())
+
+    def test_accept_marks_ads_traded(self):
+        """Проверяет, что принятое предложение снимает оба объявления с каталога."""
+        proposal = ExchangeProposal.objects.create(
+            ad_sender=self.ad, ad_receiver=self.other_ad, comment="c", status="pending"
+        )
+        second = ExchangeProposal.objects.create(
+            ad_sender=self._ad("Шлем", self.owner), ad_receiver=self.other_ad,
+            comment="c", status="pending",
+        )
+        self.client.login(username="other", password="pass")
+        self.client.post(reverse("proposal_update", args=[proposal.id]), {"status": "accepted"})
+        self.client.post(reverse("proposal_update", args=[second.id]), {"status": "accepted"})
+
+        self.assertEqual(
+            set(Ad.objects.filter(status="traded").values_list("id", flat=True)),
+            {self.ad.id, self.other_ad.id},
+        )
+        second.refresh_from_db()
+        self.assertEqual(second.status, "pending")
+
+    def test_closed_proposal_not_reopened(self):
+        """Проверяет, что принятое предложение нельзя перевести в отклонённые."""
+        proposal = ExchangeProposal.objects.create(
+            ad_sender=self.ad, ad_receiver=self.other_ad, comment="c", status="pending"
+        )
+        self.client.login(username="other", password="pass")
+        self.client.post(reverse("proposal_update", args=[proposal.id]), {"status": "accepted"})
+        self.client.post(reverse("proposal_update", args=[proposal.id]), {"status": "rejected"})
+
+        proposal.refresh_from_db()
+        self.assertEqual(proposal.status, "accepted")
+        self.assertEqual(
+            list(Ad.objects.filter(id__in=[self.ad.id, self.other_ad.id]).values_list("status", flat=True)),
+            ["traded", "traded"],
+        )
+
+    def test_edit_keeps_lifecycle_fields(self):
+        """Проверяет, что редактирование устаревшего экземпляра не возвращает статус active."""
+        stale = Ad.objects.get(id=self.ad.id)
+        Ad.objects.filter(id=self.ad.id).update(status="traded")
+        form = AdForm(data={
+            "title": "Велосипед детский", "description": "desc",
+            "category": "Sport", "condition": "used",
+        }, instance=stale)
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        self.ad.refresh_from_db()
+        self.assertEqual((self.ad.title, self.ad.status), ("Велосипед детский", "traded"))
+
+    def test_ad_list_uses_active_index(self):
+        """Проверяет, что сортировка каталога идёт по частичному индексу активных объявлений."""
+        queryset = Ad.objects.active().order_by("-created_at")
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            plan = " ".join(str(row) for row in cursor.fetchall())
+        self.assertIn("ad_active_created_idx", plan)
@@ -0,0 +1,97 @@
+import math
+import random
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from ads import geo
+from ads.forms import AdForm
+from ads.models import Ad
+
+
+class GeohashTest(SimpleTestCase):
+    def test_encode_known_value(self):
+        """Проверяет кодирование geohash на известном примере."""
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+
+    def test_covering_cells_contain_all_points_in_radius(self):
+        """Проверяет, что ячейки покрытия содержат все точки внутри радиуса."""
+        rnd = random.Random(42)
+        for _ in range(200):
+            lat, lng = rnd.uniform(-70, 70), rnd.uniform(-179, 179)
+            radius = rnd.choice([0.5, 5, 30, 150])
+            cells = geo.covering_cells(lat, lng, radius)
+            for _ in range(20):
+                # случайная точка на расстоянии не больше радиуса
+                bearing = rnd.uniform(0, 2 * math.pi)
+                dist = radius * rnd.random() * 0.999
+                plat = lat + math.degrees(dist / geo.EARTH_RADIUS_KM) * math.cos(bearing)
+                plng = lng + math.degrees(dist / geo.EARTH_RADIUS_KM) * math.sin(bearing) / math.cos(math.radians(lat))
+                if geo.haversine_km(lat, lng, plat, plng) > radius:
+                    continue
+                point_hash = geo.encode(plat, plng)
+                self.assertTrue(any(point_hash.startswith(c) for c in cells))
+
+    def test_parse_near(self):
+        """Проверяет разбор параметров near и radius."""
+        self.assertEqual(geo.parse_near("55.75,37.62", "5"), (55.75, 37.62, 5.0))
+        self.assertEqual(geo.parse_near("55.75,37.62", None), (55.75, 37.62, 10))
+        self.assertIsNone(geo.parse_near("abc", "5"))
+        self.assertIsNone(geo.parse_near("95,37", "5"))
+        self.assertIsNone(geo.parse_near("55,37", "10000"))
+        self.assertIsNone(geo.parse_near(None, None))
+
+
+class NearSearchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1", password="pass")
+
+        def ad(title, lat=None, lng=None):
+            return Ad.objects.create(
+                user=self.user, title=title, description="D", category="B",
+                condition="new", latitude=lat, longitude=lng,
+            )
+
+        self.kremlin = ad("Kremlin", 55.7520, 37.6175)
+        self.arbat = ad("Arbat", 55.7494, 37.5910)  # ~1.7 км
+        self.mytishchi = ad("Mytishchi", 55.9116, 37.7308)  # ~19 км
+        self.piter = ad("Piter", 59.9343, 30.3351)
+        self.nowhere = ad("Nowhere")
+
+    def test_geohash_filled_on_save(self):
+        """Проверяет, что geohash заполняется и сбрасывается вместе с координатами."""
+        self.assertEqual(self.kremlin.geohash, geo.encode(55.7520, 37.6175))
+        self.assertIsNone(self.nowhere.geohash)
+        self.kremlin.latitude = self.kremlin.longitude = None
+        self.kremlin.save()
+        self.assertIsNone(self.kremlin.geohash)
+
+    def test_ad_list_near(self):
+        """Проверяет фильтр ad_list по расстоянию."""
+        response = self.client.get(reverse("ad_list") + "?near=55.7520,37.6175&radius=5")
+        self.assertContains(response, "Kremlin")
+        self.assertContains(response, "Arbat")
+        self.assertNotContains(response, "Mytishchi")
+        self.assertNotContains(response, "Piter")
+        self.assertNotContains(response, "Nowhere")
+
+        response = self.client.get(reverse("ad_list") + "?near=55.7520,37.6175&radius=25")
+        self.assertContains(response, "Mytishchi")
+        self.assertNotContains(response, "Piter")
+
+    def test_ad_list_invalid_near_ignored(self):
+        """Проверяет, что некорректный near не ломает список."""
+        response = self.client.get(reverse("ad_list") + "?near=abc&radius=5")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Nowhere")
+
+    def test_form_requires_both_coordinates(self):
+        """Проверяет, что форма требует обе координаты или ни одной."""
+        data = {"title": "T", "description": "D", "category": "B", "condition": "new"}
+        self.assertTrue(AdForm(data=data).is_valid())
+        self.assertTrue(AdForm(data={**data, "latitude": 55.7, "longitude": 37.6}).is_valid())
+        form = AdForm(data={**data, "latitude": 55.7})
+        self.assertFalse(form.is_valid())
+        self.assertIn("__all__", form.errors)
+        self.assertFalse(AdForm(data={**data, "latitude": 100, "longitude": 37.6}).is_valid())
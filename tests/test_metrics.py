@@ -0,0 +1,126 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ads import metrics
+from ads.models import Ad, DailyProposalStats, ExchangeProposal, ProposalEvent
+
+
+class ProposalMetricsTest(TestCase):
+    def setUp(self):
+        self.sender = User.objects.create_user(username="sender", password="pass")
+        self.receiver = User.objects.create_user(username="receiver", password="pass")
+        self.ad_sender = Ad.objects.create(
+            user=self.sender, title="Книга", description="d", category="Books", condition="used"
+        )
+        self.ad_receiver = Ad.objects.create(
+            user=self.receiver, title="Лампа", description="d", category="Home", condition="new"
+        )
+
+    def _propose(self):
+        self.client.login(username="sender", password="pass")
+        self.client.post(reverse("proposal_create"), {
+            "ad_sender": self.ad_sender.id,
+            "ad_receiver": self.ad_receiver.id,
+            "comment": "Меняю",
+        })
+        return ExchangeProposal.objects.latest("id")
+
+    def _update(self, proposal, status):
+        self.client.login(username="receiver", password="pass")
+        self.client.post(reverse("proposal_update", args=[proposal.id]), {"status": status})
+
+    def test_views_write_status_events(self):
+        """Проверяет, что создание и смена статуса предложения пишутся в журнал событий."""
+        proposal = self._propose()
+        self._update(proposal, "accepted")
+        self._update(proposal, "accepted")
+
+        events = list(ProposalEvent.objects.order_by("id").values_list(
+            "proposal_id", "category", "from_status", "to_status"
+        ))
+        self.assertEqual(events, [
+            (proposal.id, "Home", "", "pending"),
+            (proposal.id, "Home", "pending", "accepted"),
+        ])
+
+    def test_rollup_is_incremental(self):
+        """Проверяет, что повторный запуск добавляет к агрегатам только новые события."""
+        proposal = self._propose()
+        self.assertEqual(metrics.rollup(), 1)
+
+        self._propose()
+        self._update(proposal, "accepted")
+        self.assertEqual(metrics.rollup(batch_size=1), 2)
+        self.assertEqual(metrics.rollup(), 0)
+
+        stats = DailyProposalStats.objects.get(day=timezone.localdate(), category="Home")
+        self.assertEqual((stats.created, stats.accepted, stats.rejected), (2, 1, 0))
+        self.assertEqual(stats.acceptance_count, 1)
+
+    def test_time_to_acceptance(self):
+        """Проверяет, что среднее время до принятия считается от создания предложения."""
+        proposal = self._propose()
+        ExchangeProposal.objects.filter(id=proposal.id).update(
+            created_at=timezone.now() - timedelta(hours=6)
+        )
+        proposal.refresh_from_db()
+        proposal.status = "accepted"
+        metrics.record_event(proposal, "pending")
+        metrics.rollup()
+
+        stats = DailyProposalStats.objects.get(day=timezone.localdate(), category="Home")
+        self.assertAlmostEqual(stats.avg_acceptance_hours, 6, places=1)
+
+    def test_backfill_from_existing_proposals(self):
+        """Проверяет, что backfill восстанавливает события старых предложений один раз."""
+        day = timezone.now() - timedelta(days=3)
+        old = ExchangeProposal.objects.create(
+            ad_sender=self.ad_sender, ad_receiver=self.ad_receiver, comment="c", status="rejected"
+        )
+        ExchangeProposal.objects.filter(id=old.id).update(created_at=day)
+
+        call_command("backfill_metrics", stdout=StringIO())
+        call_command("backfill_metrics", stdout=StringIO())
+
+        self.assertEqual(ProposalEvent.objects.filter(proposal_id=old.id).count(), 2)
+        stats = DailyProposalStats.objects.get(day=timezone.localdate(day), category="Home")
+        self.assertEqual((stats.created, stats.rejected), (1, 1))
+        self.assertIsNone(stats.avg_acceptance_hours)
+
+    def test_backfill_counts_creation_of_proposal_closed_after_log(self):
+        """Проверяет, что старое предложение, закрытое уже с журналом, учитывается в created."""
+        old = ExchangeProposal.objects.create(
+            ad_sender=self.ad_sender, ad_receiver=self.ad_receiver, comment="c", status="pending"
+        )
+        self._update(old, "accepted")
+
+        metrics.backfill()
+        metrics.rollup()
+
+        events = list(ProposalEvent.objects.filter(proposal_id=old.id).values_list(
+            "from_status", "to_status"
+        ).order_by("from_status"))
+        self.assertEqual(events, [("", "pending"), ("pending", "accepted")])
+        stats = DailyProposalStats.objects.get(day=timezone.localdate(), category="Home")
+        self.assertEqual((stats.created, stats.accepted), (1, 1))
+
+    def test_dashboard_staff_only(self):
+        """Проверяет, что дашборд доступен только сотрудникам и читает агрегаты."""
+        DailyProposalStats.objects.create(
+            day=timezone.localdate(), category="Garden", created=4, accepted=1
+        )
+        self.client.login(username="sender", password="pass")
+        response = self.client.get(reverse("metrics_dashboard"))
+        self.assertEqual(response.status_code, 302)
+
+        User.objects.create_user(username="ops", password="pass", is_staff=True)
+        self.client.login(username="ops", password="pass")
+        response = self.client.get(reverse("metrics_dashboard"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Garden")
@@ -0,0 +1,111 @@
+import tracemalloc
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ads.models import Ad, ExchangeProposal
+from ads.purge import purge_deleted_ads
+
+PROPOSALS = 2000
+
+
+class SoftDeleteTest(TestCase):
+    def setUp(self):
+        """Создаёт популярное объявление с большим числом входящих предложений."""
+        self.owner = User.objects.create_user(username="owner", password="pass")
+        self.other = User.objects.create_user(username="other", password="pass")
+        self.popular = Ad.objects.create(
+            user=self.owner, title="Popular", description="D", category="Books", condition="new"
+        )
+        self.offer = Ad.objects.create(
+            user=self.other, title="Offer", description="D", category="Toys", condition="used"
+        )
+        ExchangeProposal.objects.bulk_create([
+            ExchangeProposal(ad_sender=self.offer, ad_receiver=self.popular, comment=f"c{i}")
+            for i in range(PROPOSALS)
+        ])
+
+    def test_soft_delete_hides_ad(self):
+        """Проверяет, что удалённое объявление сразу исчезает из выборок и списков."""
+        self.popular.soft_delete()
+        self.assertFalse(Ad.objects.filter(id=self.popular.id).exists())
+        self.assertTrue(Ad.all_objects.filter(id=self.popular.id).exists())
+        response = self.client.get(reverse("ad_list"))
+        self.assertNotContains(response, "Popular")
+        self.assertEqual(self.client.get(reverse("ad_detail", args=[self.popular.id])).status_code, 404)
+
+        self.client.login(username="other", password="pass")
+        response = self.client.get(reverse("proposal_list"))
+        self.assertNotContains(response, "Popular")
+
+    def test_ad_delete_does_not_touch_proposals(self):
+        """Проверяет, что удаление в запросе не зависит от числа предложений."""
+        self.client.login(username="owner", password="pass")
+        url = reverse("ad_delete", args=[self.popular.id])
+        # сессия, пользователь, объявление, UPDATE (+ savepoint)
+        with self.assertNumQueries(4):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(ExchangeProposal.objects.count(), PROPOSALS)
+
+    def test_cannot_propose_to_deleted_ad(self):
+        """Проверяет, что на удалённое объявление нельзя отправить предложение."""
+        fresh = Ad.objects.create(
+            user=self.other, title="Fresh", description="D", category="Toys", condition="used"
+        )
+        self.popular.soft_delete()
+        self.client.login(username="other", password="pass")
+        self.client.post(
+            reverse("proposal_create"),
+            {"ad_sender": fresh.id, "ad_receiver": self.popular.id, "comment": "hi"},
+        )
+        self.assertFalse(ExchangeProposal.objects.filter(ad_sender=fresh).exists())
+
+    def test_purge_in_batches(self):
+        """Проверяет, что purge удаляет предложения порциями, а затем само объявление."""
+        self.popular.soft_delete()
+        ads, proposals = purge_deleted_ads(batch_size=500, pause=0, max_batches=2)
+        self.assertEqual((ads, proposals), (0, 1000))
+        self.assertTrue(Ad.all_objects.filter(id=self.popular.id).exists())
+
+        ads, proposals = purge_deleted_ads(batch_size=500, pause=0)
+        self.assertEqual((ads, proposals), (1, 1000))
+        self.assertFalse(Ad.all_objects.filter(id=self.popular.id).exists())
+        self.assertTrue(Ad.objects.filter(id=self.offer.id).exists())
+
+    def test_purge_memory_is_bounded(self):
+        """Проверяет, что purge не загружает предложения в память (в отличие от каскада)."""
+        self.popular.soft_delete()
+        tracemalloc.start()
+        try:
+            purge_deleted_ads(batch_size=500, pause=0)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(ExchangeProposal.objects.count(), 0)
+        self.assertLess(peak, 64 * 1024)
+
+    def test_purge_command(self):
+        """Проверяет запуск management-команды purge_deleted_ads."""
+        self.popular.soft_delete()
+        out = StringIO()
+        call_command("purge_deleted_ads", "--pause", "0", stdout=out)
+        self.assertIn(f"предложений — {PROPOSALS}", out.getvalue())
+
+    def test_delete_user_purges_ads_first(self):
+        """Проверяет, что delete_user вычищает объявления пользователя порциями и удаляет его."""
+        untouched = Ad.objects.create(
+            user=self.other, title="Other", description="D", category="Toys", condition="used"
+        )
+        untouched.soft_delete()
+        out = StringIO()
+        call_command("delete_user", "owner", "--pause", "0", "--batch-size", "500", stdout=out)
+
+        self.assertIn(f"предложений — {PROPOSALS}", out.getvalue())
+        self.assertFalse(User.objects.filter(username="owner").exists())
+        self.assertFalse(Ad.all_objects.filter(id=self.popular.id).exists())
+        # Удалённые объявления других пользователей ждут обычного purge_deleted_ads
+        self.assertTrue(Ad.all_objects.filter(id=untouched.id).exists())
@@ -0,0 +1,141 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from ads import percolator
+from ads.models import Ad, SavedSearch, SavedSearchMatch, SavedSearchTerm
+
+
+class PercolatorTest(TestCase):
+    def setUp(self):
+        self.buyer = User.objects.create_user(username="buyer", password="pass")
+        self.seller = User.objects.create_user(username="seller", password="pass")
+
+    def _search(self, query="", category="", condition=""):
+        return SavedSearch.objects.create(
+            user=self.buyer, query=query, category=category, condition=condition
+        )
+
+    def _ad(self, title, description="desc", category="Books", condition="used", user=None):
+        return Ad.objects.create(
+            user=user or self.seller, title=title, description=description,
+            category=category, condition=condition,
+        )
+
+    def test_search_indexed_under_one_key(self):
+        """Проверяет, что поиск попадает в обратный индекс ровно под одним ключом."""
+        search = self._search(query="Велосипед", condition="used")
+        terms = list(SavedSearchTerm.objects.filter(search=search).values_list("key", flat=True))
+        self.assertEqual(len(terms), 1)
+        self.assertIn(terms[0], percolator.search_keys("Велосипед", "", "used"))
+
+    def test_match_same_rules_as_ad_list(self):
+        """Проверяет, что совпадения считаются по тем же правилам, что и ad_list."""
+        by_query = self._search(query="vintage")
+        by_category = self._search(category="book")
+        by_condition = self._search(condition="new")
+        everything = self._search()
+        short = self._search(query="CD")
+
+        ad = self._ad("Rare VINTAGE lamp", category="Home", condition="used")
+        matched = set(percolator.match_ad(ad))
+        self.assertEqual(matched, {by_query.id, everything.id})
+
+        ad = self._ad("Old CD player", category="Books", condition="new")
+        matched = set(percolator.match_ad(ad))
+        self.assertEqual(matched, {by_category.id, by_condition.id, everything.id, short.id})
+
+    def test_cyrillic_case_same_as_ad_list(self):
+        """Проверяет, что регистр кириллицы учитывается так же, как в выдаче ad_list."""
+        lower = self._search(query="велосипед")
+        exact = self._search(query="Велосипед")
+        ad = self._ad("Велосипед горный")
+
+        matched = set(percolator.match_ad(ad))
+        for search in (lower, exact):
+            response = self.client.get(reverse("ad_list"), {"q": search.query})
+            shown = ad in response.context["page_obj"]
+            self.assertEqual(search.id in matched, shown)
+        self.assertEqual(matched, {exact.id})
+
+    def test_candidates_narrowed_by_index(self):
+        """Проверяет, что точная проверка идёт только по кандидатам из индекса."""
+        for i in range(20):
+            self._search(query=f"unrelated{i}")
+        target = self._search(query="telescope")
+        ad = self._ad("Small telescope")
+        self.assertEqual(percolator.candidate_search_ids(ad), {target.id})
+
+    def test_own_ads_not_matched(self):
+        """Проверяет, что собственные объявления не попадают в оповещения."""
+        self._search(query="lamp")
+        ad = self._ad("Lamp", user=self.buyer)
+        self.assertEqual(percolator.match_ad(ad), [])
+
+    def test_match_command_processes_new_ads_once(self):
+        """Проверяет фоновую команду: каждое новое объявление проверяется один раз."""
+        search = self._search(query="lamp")
+        ad = self._ad("Desk lamp")
+        out = StringIO()
+        call_command("match_saved_searches", "--pause", "0", stdout=out)
+        self.assertIn("совпадений: 1", out.getvalue())
+        self.assertTrue(SavedSearchMatch.objects.filter(search=search, ad=ad).exists())
+
+        out = StringIO()
+        call_command("match_saved_searches", "--pause", "0", stdout=out)
+        self.assertIn("Проверено объявлений: 0", out.getvalue())
+
+    def test_pending_ads_committed_one_by_one(self):
+        """Проверяет, что сбой на одном объявлении не откатывает уже проверенные."""
+        first, second = self._ad("Desk lamp"), self._ad("Floor lamp")
+        original = percolator.candidate_search_ids
+
+        def fail_on_second(ad):
+            if ad.id == second.id:
+                raise RuntimeError("boom")
+            return original(ad)
+
+        with mock.patch.object(percolator, "candidate_search_ids", fail_on_second):
+            with self.assertRaises(RuntimeError):
+                percolator.match_pending_ads(pause=0)
+
+        self.assertTrue(Ad.objects.get(id=first.id).searches_matched)
+        self.assertFalse(Ad.objects.get(id=second.id).searches_matched)
+
+
+class SavedSearchViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1", password="pass")
+        self.client.login(username="u1", password="pass")
+
+    def test_save_search_from_ad_list(self):
+        """Проверяет сохранение поиска и его отображение на странице поисков."""
+        response = self.client.get(reverse("ad_list") + "?q=lamp")
+        self.assertContains(response, "Сохранить поиск")
+        response = self.client.post(
+            reverse("saved_search_create"), {"query": "lamp", "category": "", "condition": ""}
+        )
+        self.assertRedirects(response, reverse("saved_search_list"))
+        self.assertTrue(SavedSearch.objects.filter(user=self.user, query="lamp").exists())
+        self.assertContains(self.client.get(reverse("saved_search_list")), "lamp")
+
+    def test_empty_search_rejected(self):
+        """Проверяет, что пустой поиск не сохраняется, а пользователь видит ошибку."""
+        response = self.client.post(
+            reverse("saved_search_create"), {"query": " ", "category": "", "condition": ""},
+            follow=True,
+        )
+        self.assertFalse(SavedSearch.objects.exists())
+        self.assertContains(response, "Укажите запрос, категорию или состояние.")
+
+    def test_delete_only_own_search(self):
+        """Проверяет, что удалить можно только свой поиск."""
+        other = User.objects.create_user(username="u2", password="pass")
+        search = SavedSearch.objects.create(user=other, query="x")
+        response = self.client.post(reverse("saved_search_delete", args=[search.id]))
+        self.assertEqual(response.status_code, 404)
+        self.assertTrue(SavedSearch.objects.filter(id=search.id).exists())
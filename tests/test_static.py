@@ -0,0 +1,72 @@
+import gzip
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "ads.storage.CompressedManifestStaticFilesStorage"},
+}
+
+
+class StaticPipelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # collectstatic со сжатием дорогой — один раз на весь класс
+        cls.static_root = Path(tempfile.mkdtemp())
+        cls.addClassCleanup(shutil.rmtree, cls.static_root)
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.static_root, STORAGES=STORAGES))
+        call_command("collectstatic", interactive=False, verbosity=0)
+        manifest = json.loads((cls.static_root / "staticfiles.json").read_text())
+        cls.hashed_css = manifest["paths"]["css/base.css"]
+
+    def test_collectstatic_writes_compressed_variants(self):
+        """Проверяет, что collectstatic создаёт хешированный файл и его gzip-копию."""
+        self.assertNotEqual(self.hashed_css, "css/base.css")
+        original = (self.static_root / self.hashed_css).read_bytes()
+        compressed = (self.static_root / (self.hashed_css + ".gz")).read_bytes()
+        self.assertEqual(gzip.decompress(compressed), original)
+
+    def test_base_template_uses_hashed_name(self):
+        """Проверяет, что страницы ссылаются на локальный CSS с хешем в имени."""
+        response = self.client.get("/")
+        self.assertContains(response, "/static/" + self.hashed_css)
+        self.assertNotContains(response, "cdn.simplecss.org")
+
+    def test_serve_gzip_with_immutable_cache(self):
+        """Проверяет отдачу gzip-версии хешированного файла с immutable-кешем."""
+        response = self.client.get(
+            "/static/" + self.hashed_css, HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertNotIn(".gz", response["Content-Disposition"])
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), (self.static_root / self.hashed_css).read_bytes())
+
+    def test_serve_identity_when_not_accepted(self):
+        """Проверяет, что без Accept-Encoding отдаётся несжатый файл."""
+        response = self.client.get(
+            "/static/" + self.hashed_css, HTTP_ACCEPT_ENCODING="gzip;q=0"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_unhashed_name_not_immutable(self):
+        """Проверяет, что файл без хеша в имени кешируется ненадолго."""
+        response = self.client.get("/static/css/base.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_path_traversal_returns_404(self):
+        """Проверяет, что выход за пределы STATIC_ROOT невозможен."""
+        response = self.client.get("/static/../manage.py")
+        self.assertEqual(response.status_code, 404)
@@ -1,4 +1,5 @@
-from django.test import TestCase, Client
+from django.conf import settings
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth.models import User
 from ads.models import Ad, ExchangeProposal
@@ -250,3 +251,45 @@ class ExchangeProposalViewTests(TestCase):
         self.assertEqual(response.status_code, 302)
         proposal.refresh_from_db()
         self.assertEqual(proposal.status, "pending")  # не изменился
+
+    def test_proposal_list_filter_options(self):
+        """Проверяет подписи и выбранный пункт в фильтрах списка предложений."""
+        self.ad1.title = "Очень длинное название объявления"
+        self.ad1.save()
+        ExchangeProposal.objects.create(ad_sender=self.ad1, ad_receiver=self.ad2, comment="hi")
+        self.client.login(username="u1", password="pass")
+        response = self.client.get(reverse("proposal_list") + f"?sender={self.ad1.id}&status=pending")
+        self.assertContains(response, "Очень длинное назван...")
+        self.assertContains(response, f'<option value="{self.ad1.id}" selected>')
+        self.assertContains(response, '<option value="pending" selected>')
+
+
+@override_settings(TEMPLATES=[settings.JINJA2_TEMPLATES, settings.DJANGO_TEMPLATES])
+class Jinja2TemplatesTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="u1", password="pass")
+        self.other_user = User.objects.create_user(username="u2", password="pass")
+        self.ad1 = Ad.objects.create(
+            user=self.user, title="MyAd", description="D1", category="Books", condition="new"
+        )
+        self.ad2 = Ad.objects.create(
+            user=self.other_user, title="OtherAd", description="D2", category="Toys", condition="used"
+        )
+        ExchangeProposal.objects.create(ad_sender=self.ad1, ad_receiver=self.ad2, comment="hi")
+
+    def test_ad_list_rendered_by_jinja2(self):
+        """Проверяет, что список объявлений рендерится портом шаблона на Jinja2."""
+        self.client.login(username="u1", password="pass")
+        response = self.client.get(reverse("ad_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.templates, [])  # шаблоны Django не участвовали
+        self.assertContains(response, "OtherAd")
+        self.assertContains(response, "Предложить обмен")
+
+    def test_proposal_list_rendered_by_jinja2(self):
+        """Проверяет рендеринг списка предложений на Jinja2."""
+        self.client.login(username="u2", password="pass")
+        response = self.client.get(reverse("proposal_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "MyAd")
+        self.assertContains(response, "Принять")